@@ -0,0 +1,128 @@
+"""In-memory prefix indexes behind the slash command autocompletes.
+
+Each guild gets a sorted index of its known streamers and one of its tracked tags. They are loaded once
+at startup and kept in sync by SQLAlchemy ORM events on Streamer, Broadcaster and SearchTags writes, so an autocomplete
+request never waits on Helix or the database.
+"""
+import bisect, logging, threading
+
+from sqlalchemy import event
+
+from database import Broadcaster, Streamer, SearchTags
+
+class PrefixIndex:
+    """Case-insensitive sorted index of (key, value) pairs answering prefix queries with bisect."""
+
+    def __init__(self):
+        self._sorted = []  # (lower-cased key, ident)
+        self._items = {}  # ident -> (lower-cased key, value)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, ident, key, value=None):
+        """Adds or replaces `ident`, searchable by `key`, returning `value` (default: key)."""
+        with self._lock:
+            self._discard(ident)
+            lowered = key.lower()
+            bisect.insort(self._sorted, (lowered, ident))
+            self._items[ident] = (lowered, value if value is not None else key)
+
+    def remove(self, ident):
+        with self._lock:
+            self._discard(ident)
+
+    def _discard(self, ident):
+        old = self._items.pop(ident, None)
+        if old:
+            position = bisect.bisect_left(self._sorted, (old[0], ident))
+            if position < len(self._sorted) and self._sorted[position] == (old[0], ident):
+                del self._sorted[position]
+
+    def search(self, prefix, limit=25):
+        """Values whose key starts with `prefix`, in key order."""
+        prefix = prefix.lower()
+        results = []
+        with self._lock:
+            position = bisect.bisect_left(self._sorted, (prefix,))
+            while position < len(self._sorted) and len(results) < limit:
+                key, ident = self._sorted[position]
+                if not key.startswith(prefix):
+                    break
+                results.append(self._items[ident][1])
+                position += 1
+        return results
+
+class AutocompleteIndex:
+    def __init__(self):
+        self.streamers = {}  # guild_id -> PrefixIndex of broadcaster_id -> (login, display name)
+        self.tags = {}  # guild_id -> PrefixIndex of tags
+        self.guilds_by_broadcaster = {}  # broadcaster_id -> guild ids it is indexed under
+
+    def _guild(self, indexes, guild_id):
+        return indexes.setdefault(str(guild_id), PrefixIndex())
+
+    def index_streamer(self, row):
+        self._guild(self.streamers, row.guild_id).add(row.broadcaster_id, row.login, (row.login, row.broadcaster_name))
+        self.guilds_by_broadcaster.setdefault(row.broadcaster_id, set()).add(str(row.guild_id))
+
+    def unindex_streamer(self, row):
+        self._guild(self.streamers, row.guild_id).remove(row.broadcaster_id)
+        self.guilds_by_broadcaster.get(row.broadcaster_id, set()).discard(str(row.guild_id))
+
+    def reindex_broadcaster(self, broadcaster):
+        """Updates a renamed broadcaster in every guild that tracks it."""
+        for guild_id in self.guilds_by_broadcaster.get(broadcaster.broadcaster_id, ()):
+            self._guild(self.streamers, guild_id).add(
+                broadcaster.broadcaster_id, broadcaster.login, (broadcaster.login, broadcaster.broadcaster_name))
+
+    def index_tags(self, row):
+        tags = PrefixIndex()
+        for tag in row.search_tags or []:
+            tags.add(tag.lower(), tag)
+        self.tags[str(row.guild_id)] = tags
+
+    def load(self, streamers, search_tags):
+        for row in streamers:
+            self.index_streamer(row)
+        for row in search_tags:
+            self.index_tags(row)
+        logging.info(f"🔤 Autocomplete index loaded: {sum(map(len, self.streamers.values()))} streamers, "
+                     f"{sum(map(len, self.tags.values()))} tags")
+
+    def search_streamers(self, guild_id, prefix, limit=25):
+        """(login, display name) pairs of the guild's streamers whose login starts with `prefix`."""
+        index = self.streamers.get(str(guild_id))
+        return index.search(prefix, limit) if index else []
+
+    def search_tags(self, guild_id, prefix, limit=25):
+        index = self.tags.get(str(guild_id))
+        return index.search(prefix, limit) if index else []
+
+    def install_listeners(self, owns_guild=lambda guild_id: True):
+        """Keeps the index in sync with every ORM write to Streamer, Broadcaster and SearchTags."""
+        def streamer_written(mapper, connection, target):
+            if owns_guild(target.guild_id):
+                self.index_streamer(target)
+
+        def streamer_deleted(mapper, connection, target):
+            self.unindex_streamer(target)
+
+        def broadcaster_written(mapper, connection, target):
+            self.reindex_broadcaster(target)
+
+        def tags_written(mapper, connection, target):
+            if owns_guild(target.guild_id):
+                self.index_tags(target)
+
+        def tags_deleted(mapper, connection, target):
+            self.tags.pop(str(target.guild_id), None)
+
+        event.listen(Streamer, "after_insert", streamer_written)
+        event.listen(Streamer, "after_update", streamer_written)
+        event.listen(Streamer, "after_delete", streamer_deleted)
+        event.listen(Broadcaster, "after_update", broadcaster_written)
+        event.listen(SearchTags, "after_insert", tags_written)
+        event.listen(SearchTags, "after_update", tags_written)
+        event.listen(SearchTags, "after_delete", tags_deleted)
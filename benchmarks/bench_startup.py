@@ -0,0 +1,50 @@
+"""Startup benchmark: imports the bot in a fresh interpreter with networking disabled.
+
+Fails (exit code 1) if importing discordBot opens a socket, loads Playwright, creates the database, or takes
+longer than the import budget.
+
+    python benchmarks/bench_startup.py [budget_seconds]
+"""
+import os, subprocess, sys, tempfile
+
+IMPORT_BUDGET_SECONDS = 1.5
+
+PROBE = """
+import socket, sys, time
+def _no_network(*args, **kwargs):
+    raise RuntimeError("network access during import")
+socket.socket.connect = _no_network
+socket.create_connection = _no_network
+
+started = time.perf_counter()
+import discordBot
+elapsed = time.perf_counter() - started
+
+problems = []
+if "playwright" in sys.modules:
+    problems.append("playwright imported")
+import os
+if os.path.exists("twitch_streamers.db"):
+    problems.append("database created")
+print(f"{elapsed:.3f}")
+print(";".join(problems))
+"""
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else IMPORT_BUDGET_SECONDS
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "PYTHONPATH": repo_root, "DISCORD_GUILD_ID": os.getenv("DISCORD_GUILD_ID", "0")}
+    with tempfile.TemporaryDirectory() as workdir:
+        result = subprocess.run([sys.executable, "-c", PROBE], cwd=workdir, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stderr)
+        sys.exit(1)
+    elapsed, problems = (result.stdout.strip().splitlines() + [""])[:2]
+    print(f"import discordBot: {float(elapsed):.3f}s (budget {budget}s)")
+    if problems:
+        print(f"side effects at import: {problems}")
+    if problems or float(elapsed) > budget:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
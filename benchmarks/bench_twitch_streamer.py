@@ -0,0 +1,86 @@
+"""Memory and construction-time benchmark for TwitchStreamer.
+
+Compares the current slotted, lazily formatted TwitchStreamer against the previous
+eager, __dict__-based layout, both built from the same Helix payloads.
+
+    python benchmarks/bench_twitch_streamer.py [count]
+"""
+import os, sys, time, tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from twitchFuncs import TwitchStreamer
+
+USER = {
+    "id": "735927359", "login": "shotsbyajc", "display_name": "ShotsByAJC", "broadcaster_type": "affiliate",
+    "created_at": "2021-12-01T10:00:00Z", "description": "Photography, editing and chill vibes.",
+    "offline_image_url": "", "profile_image_url": "https://static-cdn.jtvnw.net/jtv_user_pictures/x-300x300.png",
+    "view_count": 0,
+}
+CHANNEL = {
+    "broadcaster_id": "735927359", "broadcaster_login": "shotsbyajc", "broadcaster_name": "ShotsByAJC",
+    "broadcaster_language": "en", "game_id": "509660", "game_name": "Art",
+    "title": "Late Night Editing. PoE later? Maybe?",
+    "tags": ["AMA", "ChillVibes", "English", "Photoshop", "Editing", "Photography"],
+}
+STREAM = {
+    "user_id": "735927359", "user_login": "shotsbyajc", "user_name": "ShotsByAJC", "game_id": "509660",
+    "game_name": "Art", "type": "live", "title": "Late Night Editing. PoE later? Maybe?", "viewer_count": 5,
+    "started_at": "2025-03-01T03:25:00Z", "language": "en", "is_mature": False,
+    "thumbnail_url": "https://static-cdn.jtvnw.net/previews-ttv/live_user_shotsbyajc-{width}x{height}.jpg",
+}
+
+class LegacyTwitchStreamer():
+    """The previous TwitchStreamer layout: a plain object with every display field formatted eagerly."""
+
+    def __init__(self, user, channel, stream):
+        self.broadcaster_login = user["login"]
+        self.broadcaster_id = user["id"]
+        self.broadcaster_name = user["display_name"]
+        self.broadcaster_type = user["broadcaster_type"]
+        self.created_at = user["created_at"]
+        self.description = user["description"]
+        self.offline_image_url = user["offline_image_url"]
+        self.profile_image_url = user["profile_image_url"]
+        self.broadcaster_language = channel["broadcaster_language"]
+        self.game_id = channel["game_id"]
+        self.game_name = channel["game_name"]
+        self.title = channel["title"]
+        self.channel_tags = channel["tags"]
+        self.url = f"https://www.twitch.tv/{self.broadcaster_login}"
+        self.type = stream["type"]
+        self.is_live = self.type == "live"
+        self.is_partnered = None
+        self.is_verified = None
+        self.started_at = stream["started_at"]
+        self.is_mature = stream["is_mature"]
+        start_time = datetime.strptime(self.started_at, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        hours, remainder = divmod(int((datetime.now(timezone.utc) - start_time).total_seconds()), 3600)
+        minutes, _ = divmod(remainder, 60)
+        self.live_for = f"{hours}:{minutes:02d}" if hours else f"{minutes} mins"
+        self.mature_flag = " 🔞" if self.is_mature else ""
+        self.viewers = stream["viewer_count"]
+        self.thumbnail_url = stream["thumbnail_url"]
+        self.live_status = "🟢 **Live Now**" if self.is_live else "⚫ **Offline Now**"
+        self.live_message = f"{self.live_status} | **Live for:** `{self.live_for}`"
+        self.streamer_display = f"[{self.broadcaster_name}](https://twitch.tv/{self.broadcaster_login}){self.mature_flag}"
+
+def measure(label, build, count):
+    tracemalloc.start()
+    started = time.perf_counter()
+    instances = [build() for _ in range(count)]
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} {size / count:8.0f} bytes/instance  {elapsed / count * 1e6:8.2f} µs/instance")
+    return instances
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print(f"Building {count} streamers from Helix payloads")
+    measure("legacy", lambda: LegacyTwitchStreamer(USER, CHANNEL, STREAM), count)
+    measure("slotted", lambda: TwitchStreamer.from_helix(USER, CHANNEL, STREAM), count)
+
+if __name__ == '__main__':
+    main()
@@ -1,30 +1,129 @@
+import time
+STARTUP_STARTED = time.perf_counter()
+
+import asyncio, csv, io, re
+from collections import OrderedDict
 from datetime import datetime, timezone
 
-import discord, logging, os
+import aiohttp, discord, logging, os
 from discord import app_commands
 from discord.ext import commands, tasks
-# Establish Environmental Variables
+# Establish Environmental Variables before the modules that read them
 from dotenv import load_dotenv
+load_dotenv()
 
-from database import db_manager, Streamer, ServerSettings, SearchTags
-from twitchFuncs import TwitchStreamer, search_live_channel_by_tag, search_channels_by_term, get_multiple_streams
+from autocompleteIndex import AutocompleteIndex
+from database import db_manager, init_db, Streamer, ServerSettings, SearchTags
+from gameCatalog import load_game_catalog, resolve_games, game_name, game_ids_named, search_games
+from discoveryWorker import due_by_tag, scan_tags, last_scanned
+from profiling import CycleProfiler, LoopWatchdog
+from reactionQueue import CoalescingQueue
+from resilience import breaker_states
+from scanScheduler import ScanScheduler
+from sharding import SHARD_COUNT, SHARD_IDS, owns_guild
+from streamerRefresher import refresh_stale_streamers
+from stateSnapshot import register as register_snapshot, load_snapshot, save_snapshot
+from twitchFuncs import TwitchStreamer, get_headers, search_channels_by_term, get_multiple_streams, \
+    hydrate_streamers, normalize_tag, USER_CACHE_TTL, dump_user_cache, load_user_cache
+from viewerStats import record_viewer_samples, roll_up_viewer_samples, get_viewer_stats
 
-load_dotenv()
 TOKEN = os.getenv("DISCORD_BOT_TOKEN")
 GUILD_ID = os.getenv("DISCORD_GUILD_ID")
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "512"))
+# "inline" scans tags in this process, "worker" only drains what discoveryWorker.py finds
+DISCOVERY_MODE = os.getenv("DISCOVERY_MODE", "inline").lower()
+# Seconds from launch to the gateway being ready; exceeding it is logged as a warning
+STARTUP_TARGET_SECONDS = float(os.getenv("STARTUP_TARGET_SECONDS", "10"))
+# /live answers from the viewer sampler's snapshot while it is younger than this
+LIVE_SNAPSHOT_MAX_AGE = int(os.getenv("LIVE_SNAPSHOT_MAX_AGE", "120"))
+SCAN_CURSOR_TTL = int(os.getenv("SCAN_CURSOR_TTL", "86400"))
+# Approval reactions are collected for REACTION_BATCH_WINDOW seconds and applied together
+REACTION_BATCH_WINDOW = float(os.getenv("REACTION_BATCH_WINDOW", "1"))
+REACTION_BATCH_SIZE = int(os.getenv("REACTION_BATCH_SIZE", "100"))
+REACTION_CONCURRENCY = int(os.getenv("REACTION_CONCURRENCY", "5"))
+REACTION_DECISIONS = {"✅": "approved", "❌": "rejected"}
+# Discord's per-message limits
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000  # summed over all embeds of a message
+MAX_CONTENT_CHARS = 2000
+
+# Latest sample_live_viewers poll: which broadcaster ids were polled and the streams that were live
+live_snapshot = {"taken_at": 0, "polled": [], "streams": {}}
+
+cycle_profiler = CycleProfiler()
+loop_watchdog = LoopWatchdog()
+scan_scheduler = ScanScheduler()
+autocomplete_index = AutocompleteIndex()
+reaction_queue = CoalescingQueue()
+# Bounds the Discord calls made while applying a reaction batch
+reaction_semaphore = asyncio.Semaphore(REACTION_CONCURRENCY)
+
+def load_autocomplete_index():
+    autocomplete_index.load([row for row in db_manager.get_all(Streamer) if owns_guild(row.guild_id)],
+                            [row for row in db_manager.get_all(SearchTags) if owns_guild(row.guild_id)])
+
+async def load_database():
+    """Creates the tables, then fills the game catalog and autocomplete index from them side by side."""
+    await asyncio.to_thread(init_db)
+    await asyncio.gather(asyncio.to_thread(load_game_catalog), asyncio.to_thread(load_autocomplete_index))
+
+class Client(commands.AutoShardedBot):
+    async def setup_hook(self):
+        loop_watchdog.start()
+        cycle_profiler.install_signal_handler(self.loop)
+        autocomplete_index.install_listeners(owns_guild)
+        # Blocking initialisation runs concurrently in threads while the gateway connects
+        db_result, token_result, snapshot_result = await asyncio.gather(
+            load_database(), asyncio.to_thread(get_headers), asyncio.to_thread(load_snapshot),
+            return_exceptions=True)
+        if isinstance(db_result, Exception):
+            raise db_result
+        if isinstance(token_result, Exception):
+            logging.error(f"⚠️ Could not prefetch Twitch OAuth token, retrying on first use: {token_result}")
+        if isinstance(snapshot_result, Exception):
+            logging.error(f"⚠️ Could not load state snapshot, starting cold: {snapshot_result}")
+        logging.info(f"🚀 Initialisation finished {time.perf_counter() - STARTUP_STARTED:.2f}s after launch")
 
-logging.basicConfig(level=logging.INFO)
-
-class Client(commands.Bot):
     async def on_ready(self):
-        logging.info(f"Logged in as {self.user} (ID: {self.user.id})")
-        try:
-            guild = discord.Object(id=GUILD_ID)
-            synced = await self.tree.sync(guild=guild)
-            logging.info(f"Synced {len(synced)} command(s)")
-        except Exception as e:
-            logging.info(f"Error syncing commands: {e}")
-        check_for_new_streamers.start()
+        logging.info(f"Logged in as {self.user} (ID: {self.user.id}) running shards {sorted(self.shards)}")
+        # on_ready fires again after reconnects, only the first one measures startup
+        if getattr(self, "startup_seconds", None) is None:
+            self.startup_seconds = time.perf_counter() - STARTUP_STARTED
+            if self.startup_seconds > STARTUP_TARGET_SECONDS:
+                logging.warning(f"🐢 Ready {self.startup_seconds:.2f}s after launch (target {STARTUP_TARGET_SECONDS}s)")
+            else:
+                logging.info(f"🚀 Ready {self.startup_seconds:.2f}s after launch")
+        # Only the process that owns the home guild syncs its commands
+        if owns_guild(GUILD_ID):
+            try:
+                guild = discord.Object(id=GUILD_ID)
+                synced = await self.tree.sync(guild=guild)
+                logging.info(f"Synced {len(synced)} command(s)")
+            except Exception as e:
+                logging.info(f"Error syncing commands: {e}")
+        if DISCOVERY_MODE == "worker":
+            if not drain_discovery_outbox.is_running():
+                drain_discovery_outbox.start()
+        elif not check_for_new_streamers.is_running():
+            # Restored scan cursors push back tags the previous process scanned recently
+            scan_scheduler.sync(db_manager.get_all(SearchTags), last_scanned,
+                                owns=lambda guild_id, tag: owns_guild(guild_id))
+            check_for_new_streamers.start()
+        if not sample_live_viewers.is_running():
+            sample_live_viewers.start()
+        if not roll_up_viewer_stats.is_running():
+            roll_up_viewer_stats.start()
+        if not save_state_snapshot.is_running():
+            save_state_snapshot.start()
+        if not refresh_streamers.is_running():
+            refresh_streamers.start()
+        if not apply_reaction_batches.is_running():
+            apply_reaction_batches.start()
+
+    async def close(self):
+        save_snapshot()
+        await super().close()
+
     async def on_message(self, message):
         if message.author == self.user:
             return
@@ -33,7 +132,7 @@ class Client(commands.Bot):
 
 intents = discord.Intents.default()
 intents.message_content = True
-client = Client(command_prefix="!", intents=intents)
+client = Client(command_prefix="!", intents=intents, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS)
 
 def get_channel_settings(guild_id):
     server_settings = db_manager.get_one(ServerSettings, guild_id=guild_id)
@@ -42,7 +141,59 @@ def get_channel_settings(guild_id):
     else:
         return server_settings
 
+class EmbedCache:
+    """Size-bounded LRU of rendered embed payloads, keyed by the streamer fields each embed renders."""
+
+    def __init__(self, max_size=EMBED_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, kind, key, render):
+        """Returns a fresh Embed for (kind, key), calling render() only on a cache miss."""
+        cache_key = (kind, key)
+        payload = self.entries.get(cache_key)
+        if payload is None:
+            self.misses += 1
+            payload = render().to_dict()
+            self.entries[cache_key] = payload
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self.entries.move_to_end(cache_key)
+        return discord.Embed.from_dict(self.copy_payload(payload))
+
+    @staticmethod
+    def copy_payload(payload):
+        """Copies a payload down to its nested dicts (fields, image, footer...), which Embed edits in place,
+        so callers never change the cached payload."""
+        return {key: [dict(field) for field in value] if key == "fields"
+                else dict(value) if isinstance(value, dict) else value
+                for key, value in payload.items()}
+
+embed_cache = EmbedCache()
+
+def streamer_embed_key(input_streamer, *extra):
+    """Snapshot of the streamer fields rendered by the streamer embeds."""
+    return (
+        input_streamer.broadcaster_login, input_streamer.broadcaster_name, input_streamer.broadcaster_type,
+        input_streamer.description, input_streamer.profile_image_url, input_streamer.is_live,
+        input_streamer.is_mature, input_streamer.game_name, input_streamer.game_id, input_streamer.title,
+        input_streamer.viewers, input_streamer.broadcaster_language, tuple(input_streamer.channel_tags or ()),
+        input_streamer.thumbnail_url, *extra,
+    )
+
 def embed_streamer_standard(input_streamer):
+    return embed_cache.get_or_render("standard", streamer_embed_key(input_streamer),
+                                     lambda: render_streamer_standard(input_streamer))
+
+def embed_streamer_pending(input_streamer):
+    return embed_cache.get_or_render("pending", streamer_embed_key(input_streamer, input_streamer.live_for),
+                                     lambda: render_streamer_pending(input_streamer))
+
+def render_streamer_standard(input_streamer):
     embed = discord.Embed(
         description=f"**{input_streamer.description}**" if input_streamer.description else "No description available.",
         color=discord.Color.green() if input_streamer.is_live else discord.Color.dark_gray()
@@ -69,7 +220,7 @@ def embed_streamer_standard(input_streamer):
         embed.set_image(url=input_streamer.get_thumbnail_url(width="1920", height="1080"))
     return embed
 
-def embed_streamer_pending(input_streamer):
+def render_streamer_pending(input_streamer):
     # Build Embed
     embed = discord.Embed(
         title=f"📌 Pending Streamer Approval: {input_streamer.broadcaster_name}",
@@ -98,6 +249,58 @@ def embed_streamer_pending(input_streamer):
 
     return embed
 
+def broadcast_batches(streamers):
+    """Splits approved TwitchStreamers into (content, embeds) messages that stay within Discord's limits.
+
+    A message takes up to MAX_EMBEDS_PER_MESSAGE embeds, as long as their combined length stays within
+    MAX_EMBED_CHARS_PER_MESSAGE and the announcement lines within MAX_CONTENT_CHARS.
+    """
+    batches = []
+    lines, embeds, embed_chars, content_chars = [], [], 0, 0
+    for info in streamers:
+        embed = embed_streamer_standard(info)
+        line = f"{info.streamer_display} — {info.live_message}"
+        if embeds and (len(embeds) == MAX_EMBEDS_PER_MESSAGE
+                       or embed_chars + len(embed) > MAX_EMBED_CHARS_PER_MESSAGE
+                       or content_chars + len(line) + 1 > MAX_CONTENT_CHARS):
+            batches.append(("\n".join(lines), embeds))
+            lines, embeds, embed_chars, content_chars = [], [], 0, 0
+        lines.append(line)
+        embeds.append(embed)
+        embed_chars += len(embed)
+        content_chars += len(line) + 1
+    if embeds:
+        batches.append(("\n".join(lines), embeds))
+    return batches
+
+async def send_approved_broadcast_batch(channel, streamers):
+    """Announces several approved TwitchStreamers using as few messages as Discord's limits allow."""
+    if channel is None:
+        logging.error("send_approved_broadcast_batch: Received None for channel.")
+        return
+    for content, embeds in broadcast_batches(streamers):
+        try:
+            await channel.send(content=content, embeds=embeds)
+        except Exception as e:
+            logging.error(f"Failed to send broadcast batch: {e}")
+    logging.info(f"Broadcast {len(streamers)} approved streamers to channel {channel.id}")
+
+async def delete_approval_messages(channel, message_ids):
+    """Deletes approval messages in bulk (100 per call), one by one for messages too old to bulk delete."""
+    message_ids = [int(message_id) for message_id in message_ids if message_id and str(message_id).isdigit()]
+    if channel is None or not message_ids:
+        return
+    for i in range(0, len(message_ids), 100):
+        chunk = [discord.Object(id=message_id) for message_id in message_ids[i:i + 100]]
+        try:
+            await channel.delete_messages(chunk)
+        except discord.HTTPException:
+            for message in chunk:
+                try:
+                    await channel.get_partial_message(message.id).delete()
+                except discord.HTTPException as e:
+                    logging.warning(f"Could not delete approval message {message.id}: {e}")
+
 async def send_approved_streamer_broadcast(channel, embed, live_message):
     if channel is None:
         logging.error("send_approved_streamer_broadcast: Received None for channel.")
@@ -110,29 +313,32 @@ async def send_approved_streamer_broadcast(channel, embed, live_message):
     except Exception as e:
         logging.error(f"Failed to send broadcast message: {e}")
 
-async def add_approved_streamer(channel: discord.TextChannel,guild_id, broadcaster_login):
-    info = TwitchStreamer(broadcaster_login=broadcaster_login)
+def streamer_entry(guild_id, info, status, message_id=""):
+    """Builds a Streamer DB row for a guild from a TwitchStreamer."""
+    return Streamer(
+        guild_id=str(guild_id),
+        broadcaster_id=info.broadcaster_id,
+        broadcaster_name=info.broadcaster_name,
+        stream_url=info.url,
+        status=status,
+        message_id=message_id,
+        updated_at=datetime.now(timezone.utc),
+        broadcaster_language=info.broadcaster_language,
+        viewers=info.viewers,
+        game_name=info.game_name,
+        game_id=info.game_id,
+        title=info.title,
+        tags=info.channel_tags,
+    )
+
+async def add_approved_streamer(channel: discord.TextChannel,guild_id, broadcaster_login, hedge=False):
+    info = await asyncio.to_thread(TwitchStreamer, broadcaster_login=broadcaster_login, hedge=hedge)
     embed = embed_streamer_standard(info)
     await send_approved_streamer_broadcast(channel, embed, info.live_message)
     # Create Streamer DB entry
     existing_streamer = db_manager.get_one(Streamer, guild_id=guild_id, broadcaster_id=info.broadcaster_id)
     if not existing_streamer:
-        new_approved = Streamer(
-            guild_id=guild_id,
-            broadcaster_id=info.broadcaster_id,
-            broadcaster_name=info.broadcaster_name,
-            stream_url=info.url,
-            status="approved",
-            message_id="",
-            updated_at=datetime.now(timezone.utc),
-            broadcaster_language=info.broadcaster_language,
-            viewers=info.viewers,
-            game_name=info.game_name,
-            game_id=info.game_id,
-            title=info.title,
-            tags=info.channel_tags,
-        )
-        db_manager.add_entry(new_approved)
+        db_manager.add_entry(streamer_entry(guild_id, info, "approved"))
 
 
 async def send_pending_streamer_message(channel: discord.TextChannel, input_streamer):
@@ -146,28 +352,15 @@ async def send_pending_streamer_message(channel: discord.TextChannel, input_stre
 
     return message
 
-async def add_pending_approval(channel: discord.TextChannel,guild_id, broadcaster_login):
-    info = TwitchStreamer(broadcaster_login=broadcaster_login)
+async def add_pending_approval(channel: discord.TextChannel,guild_id, info):
+    """Posts an already hydrated TwitchStreamer for approval unless the guild tracks it already."""
     existing_streamer = db_manager.get_one(Streamer, guild_id=guild_id, broadcaster_id=info.broadcaster_id)
     if not existing_streamer:
         logging.info("STREAMER WAS NOT FOUND ADDING PENDING APPROVAL")
         message = await send_pending_streamer_message(channel, input_streamer=info)
-        new_pending = Streamer(
-            guild_id=guild_id,
-            broadcaster_id=info.broadcaster_id,
-            broadcaster_name=info.broadcaster_name,
-            stream_url=info.url,
-            status="pending",
-            message_id=str(message.id),
-            updated_at=datetime.now(timezone.utc),
-            broadcaster_language=info.broadcaster_language,
-            viewers=info.viewers,
-            game_name=info.game_name,
-            game_id=info.game_id,
-            title=info.title,
-            tags=info.channel_tags,
-        )
-        db_manager.add_entry(new_pending)
+        db_manager.add_entry(streamer_entry(guild_id, info, "pending", message_id=str(message.id)))
+        return True
+    return False
 
 @client.tree.command(
     name="setup",
@@ -222,6 +415,27 @@ async def settings(interaction: discord.Interaction):
 
     await interaction.response.send_message(embed=embed)
 
+def streamer_choices(guild_id, current):
+    choices = []
+    for login, display_name in autocomplete_index.search_streamers(guild_id, current):
+        label = f"{display_name} ({login})" if display_name and display_name.lower() != login else login
+        choices.append(app_commands.Choice(name=label[:100], value=login))
+    return choices
+
+async def streamer_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggests the guild's known streamers from the in-memory index"""
+    return streamer_choices(interaction.guild_id, current)
+
+async def search_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggests the guild's tracked tags, then its known streamers"""
+    tags = [app_commands.Choice(name=f"#{tag}"[:100], value=tag)
+            for tag in autocomplete_index.search_tags(interaction.guild_id, current)]
+    return (tags + streamer_choices(interaction.guild_id, current))[:25]
+
+async def category_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggests categories from the local game catalog"""
+    return [app_commands.Choice(name=name[:100], value=name[:100]) for name in search_games(current)]
+
 @client.tree.command(name="streamer", description="Manage streamers (add or remove)", guild=discord.Object(id=GUILD_ID))
 @app_commands.default_permissions(administrator=True)
 @app_commands.describe(
@@ -235,10 +449,13 @@ async def settings(interaction: discord.Interaction):
         app_commands.Choice(name="Pending", value="pending")
     ]
 )
+@app_commands.autocomplete(info=streamer_autocomplete)
 async def streamer(interaction: discord.Interaction, action: str, info: str):
     if info.startswith("https://twitch.tv/") or info.startswith("https://www.twitch.tv/"):
         info = info.split("/")[-1]
-    i = TwitchStreamer(info)
+    # Helix calls block while retrying or hedging, so they run off the event loop
+    i = TwitchStreamer(info, lazy=True, hedge=True)
+    await asyncio.to_thread(i.load, "users")
     if i.broadcaster_id:
         """With valid information we check for corrections and perform accordingly, additionally we verify if there's a broadcaster id"""
         logging.info(f"{info} was found with data! Attempting to perform {action} action...")
@@ -255,13 +472,16 @@ async def streamer(interaction: discord.Interaction, action: str, info: str):
         channel = client.get_channel(int(broadcast_channel))
         # Collection of current DB item if found.
         streamer_db = db_manager.get_one(Streamer, guild_id=interaction.guild_id, broadcaster_id=i.broadcaster_id)
-        # create the embed to send / manipulate
-        embed = embed_streamer_standard(i)
+        if action != "rejected" or not streamer_db:
+            # Embeds and new rows also need the channel and stream fields
+            await asyncio.to_thread(i.update)
 
         # Update message title or create a pending message for actions.
         if action == 'approved':
+            # create the embed to send / manipulate
+            embed = embed_streamer_standard(i)
             # embed.title(f'Adding the streamer: {info}')
-            message = await send_approved_streamer_broadcast(broadcast_channel,interaction.guild_id,i.broadcaster_name)
+            message = await send_approved_streamer_broadcast(channel, embed, i.live_message)
             await interaction.response.send_message(f"Streamer approved: {info}")
         elif action == 'rejected':
             # embed.title(f'Rejecting the streamer: {info}')
@@ -271,28 +491,17 @@ async def streamer(interaction: discord.Interaction, action: str, info: str):
             message = await send_pending_streamer_message(channel, i)
             await interaction.response.send_message(f"Sending {info} to pending approvals. [Click to view](https://discord.com/channels/{interaction.guild_id}/{channel.id}/{message.id})")
 
+        # Reactions are matched to rows by the pending approval message
+        message_id = str(message.id) if action == "pending" else ""
         if streamer_db:
             streamer_db.status = action
             streamer_db.updated_at = datetime.now(timezone.utc)
+            if message_id:
+                streamer_db.message_id = message_id
             db_manager.add_entry(streamer_db)
         else:
             logging.info(f"Streamer {i.broadcaster_id} not found in database. Creating a new entry...")
-            streamer_entry = Streamer(
-                guild_id=interaction.guild_id,
-                message_id=interaction.id,
-                broadcaster_id=i.broadcaster_id,
-                broadcaster_name=i.broadcaster_login,
-                broadcaster_language=i.broadcaster_language,
-                viewers=i.viewers,
-                game_name=i.game_name,
-                game_id=i.game_id,
-                title=i.title,
-                tags=i.channel_tags,  # Stores list of tags
-                stream_url=f"https://twitch.tv/{i.broadcaster_login}",
-                status=action,
-                updated_at=datetime.now(timezone.utc),
-            )
-            db_manager.add_entry(streamer_entry)
+            db_manager.add_entry(streamer_entry(interaction.guild_id, i, action, message_id=message_id))
     else:
         await interaction.response.send_message(
             f"Sorry we can't {action} your input '{info}'. It did not produce the proper response. Please try again.",
@@ -343,20 +552,21 @@ class SearchListView(discord.ui.View):
         self.author_id = author_id
         self.current_page = 0
         self.i = None
-        self.embed = self.generate_embed()
+        self.embed = None  # built by generate_embed()
 
     def server_settings(self, guild_id):
         channel_settings = get_channel_settings(guild_id)
         return channel_settings
 
-    def generate_embed(self):
-        self.i = TwitchStreamer(self.data[self.current_page].get('broadcaster_login'))
+    async def generate_embed(self):
+        self.i = await asyncio.to_thread(TwitchStreamer, self.data[self.current_page].get('broadcaster_login'),
+                                         hedge=True)
         embed = embed_streamer_standard(self.i)
         embed.set_footer(text=f"Page {self.current_page + 1} of {len(self.data) + 1}")
         return embed
 
     async def update_message(self, interaction: discord.Interaction):
-        self.embed = self.generate_embed()
+        self.embed = await self.generate_embed()
         await interaction.response.edit_message(embed=self.embed, view=self)
 
     async def add_streamer(self, interaction: discord.Interaction):
@@ -365,7 +575,7 @@ class SearchListView(discord.ui.View):
             channel = client.get_channel(server_settings.broadcast_channel_id)
         else:
             channel = interaction.channel
-        await add_approved_streamer(channel,interaction.guild_id,self.i.broadcaster_name)
+        await add_approved_streamer(channel,interaction.guild_id,self.i.broadcaster_name, hedge=True)
         await interaction.response.edit_message(
             content=f"{self.i.broadcaster_name} has been added, sending broadcast: ",embed=None, view=None)
 
@@ -377,22 +587,7 @@ class SearchListView(discord.ui.View):
             await interaction.response.edit_message(
                 content=f"{self.i.broadcaster_name} has been removed...", embed=None, view=None)
         else:
-            new_approved = Streamer(
-                guild_id=interaction.guild_id,
-                broadcaster_id=self.i.broadcaster_id,
-                broadcaster_name=self.i.broadcaster_name,
-                stream_url=self.i.url,
-                status="rejected",
-                message_id="",
-                updated_at=datetime.now(timezone.utc),
-                broadcaster_language=self.i.broadcaster_language,
-                viewers=self.i.viewers,
-                game_name=self.i.game_name,
-                game_id=self.i.game_id,
-                title=self.i.title,
-                tags=self.i.channel_tags,
-            )
-            db_manager.add_entry(new_approved)
+            db_manager.add_entry(streamer_entry(interaction.guild_id, self.i, "rejected"))
             await interaction.response.edit_message(
                 content=f"{self.i.broadcaster_name} has been added to the DB, and rejected.", embed=None, view=None)
 
@@ -449,12 +644,19 @@ class SearchListView(discord.ui.View):
 @client.tree.command(name="search", description="View current bot configuration for this server",
                      guild=discord.Object(id=GUILD_ID))
 @app_commands.default_permissions(administrator=True)
-async def search(interaction: discord.Interaction, search_term: str):
+@app_commands.describe(category="Only show channels streaming this category")
+@app_commands.autocomplete(search_term=search_autocomplete, category=category_autocomplete)
+async def search(interaction: discord.Interaction, search_term: str, category: str = None):
     """Searches Twitch for a particular term."""
     # await interaction.response.defer()
-    results = search_channels_by_term(search_term)
+    results = await asyncio.to_thread(search_channels_by_term, search_term, hedge=True)
+    if results.get('success') and category:
+        game_ids = game_ids_named(category)
+        results["data"] = [channel for channel in results["data"] if channel.get("game_id") in game_ids]
+        results["success"] = bool(results["data"])
     if results.get('success'):
         view = SearchListView(results, interaction.user.id)
+        view.embed = await view.generate_embed()
         await interaction.response.send_message(embed=view.embed, view=view)
     else:
         await interaction.response.send_message(f"Sorry no results found for {search_term}")
@@ -462,63 +664,88 @@ async def search(interaction: discord.Interaction, search_term: str):
 
 @client.event
 async def on_raw_reaction_add(payload):
-    message_id = str(payload.message_id)
-    pending_streamer = db_manager.get_one(Streamer, guild_id=payload.guild_id, message_id=message_id, status="pending")
-
-    if not pending_streamer:
-        return  # Ignore reactions on non-pending streamers
-
-    guild = client.get_guild(payload.guild_id)
-    channel = guild.get_channel(payload.channel_id) if guild else None
-    message = await channel.fetch_message(payload.message_id) if channel else None
-
-    if not message:
-        logging.error("Message not found or inaccessible.")
-        return
-
-    server_settings = db_manager.get_one(ServerSettings, guild_id=payload.guild_id)
+    """Queues approve/reject reactions; apply_reaction_batches() applies them."""
+    decision = REACTION_DECISIONS.get(str(payload.emoji))
+    if decision is None or payload.guild_id is None or payload.user_id == client.user.id:
+        return  # Ignore other reactions and the bot's own
+    reaction_queue.push(payload.message_id, (payload.guild_id, payload.channel_id, decision))
+
+async def apply_guild_reactions(guild_id, reactions):
+    """Applies one guild's {message_id: (channel_id, decision)} reactions with a single DB transaction."""
+    pending = await asyncio.to_thread(db_manager.get_by_message_ids, guild_id, list(reactions))
+    if not pending:
+        return  # Not approval messages, or already decided
+    reactions = {str(message_id): reaction for message_id, reaction in reactions.items()}
+    decisions = {row.broadcaster_id: reactions[row.message_id][1] for row in pending}
+    updated = await asyncio.to_thread(db_manager.apply_status_decisions, guild_id, decisions)
+
+    server_settings = get_channel_settings(str(guild_id))
     broadcast_channel = None
-
     if server_settings and server_settings.broadcast_channel_id:
         broadcast_channel = client.get_channel(int(server_settings.broadcast_channel_id))
-
-    # Fallback if broadcast_channel is not defined or accessible
     if not broadcast_channel:
-        broadcast_channel = channel
+        # Fallback if broadcast_channel is not defined or accessible
+        broadcast_channel = client.get_channel(next(iter(reactions.values()))[0])
         logging.warning("Using fallback broadcast channel (current channel).")
 
-    if str(payload.emoji) == "✅":
-        pending_streamer.status = "approved"
-        new_content = f"✅ **{pending_streamer.broadcaster_name}** has been **approved**!"
-        logging.info(f"Approving streamer {pending_streamer.broadcaster_name}")
-        await add_approved_streamer(broadcast_channel, payload.guild_id, pending_streamer.broadcaster_name)
-
-    elif str(payload.emoji) == "❌":
-        pending_streamer.status = "rejected"
-        new_content = f"❌ **{pending_streamer.broadcaster_name}** has been **rejected**."
-        logging.info(f"Rejecting streamer {pending_streamer.broadcaster_name}")
-    else:
-        return  # Ignore other reactions
-
-    pending_streamer.updated_at = datetime.now(timezone.utc)
-    db_manager.add_entry(pending_streamer)
+    approved_logins = [row.login for row in updated if row.status == "approved"]
+    approved = []
+    for i in range(0, len(approved_logins), 100):
+        approved += await asyncio.to_thread(hydrate_streamers, approved_logins[i:i + 100])
+    await send_approved_broadcast_batch(broadcast_channel, approved)
 
-    await message.clear_reactions()
-    await message.edit(content=new_content, embed=None)
+    async def close_approval_message(row):
+        channel = client.get_channel(reactions[row.message_id][0])
+        if channel is None:
+            return
+        if row.status == "approved":
+            new_content = f"✅ **{row.broadcaster_name}** has been **approved**!"
+        else:
+            new_content = f"❌ **{row.broadcaster_name}** has been **rejected**."
+        message = channel.get_partial_message(int(row.message_id))
+        async with reaction_semaphore:
+            try:
+                await message.clear_reactions()
+                await message.edit(content=new_content, embed=None)
+            except discord.HTTPException as e:
+                logging.warning(f"Could not update approval message {row.message_id}: {e}")
+
+    await asyncio.gather(*(close_approval_message(row) for row in updated))
+
+@tasks.loop(seconds=REACTION_BATCH_WINDOW)
+async def apply_reaction_batches():
+    """Applies the queued approval reactions, one batch per guild."""
+    batch = reaction_queue.take(REACTION_BATCH_SIZE)
+    if not batch:
+        return
+    by_guild = {}
+    for message_id, (guild_id, channel_id, decision) in batch:
+        by_guild.setdefault(guild_id, {})[message_id] = (channel_id, decision)
+    try:
+        results = await asyncio.gather(*(apply_guild_reactions(guild_id, reactions)
+                                         for guild_id, reactions in by_guild.items()), return_exceptions=True)
+        for guild_id, result in zip(by_guild, results):
+            if isinstance(result, Exception):
+                logging.error(f"⚠️ Failed to apply reactions for guild {guild_id}: {result}")
+    finally:
+        reaction_queue.done(message_id for message_id, _ in batch)
+    logging.info(f"🗳️ Applied {len(batch)} approval reactions across {len(by_guild)} guilds")
 
 
 @client.tree.command(name="live", description="Shows all currently live streamers from approved list",
                      guild=discord.Object(id=GUILD_ID))
 @app_commands.default_permissions(administrator=True)
 @app_commands.describe(
-    streamer_type="List who's live: approved or pending")
+    streamer_type="List who's live: approved or pending",
+    category="Only list streamers live in this category")
 @app_commands.choices(
     streamer_type=[
         app_commands.Choice(name="Approved", value="approved"),
         app_commands.Choice(name="Pending", value="pending")
     ]
 )
-async def live(interaction: discord.Interaction, streamer_type: str):
+@app_commands.autocomplete(category=category_autocomplete)
+async def live(interaction: discord.Interaction, streamer_type: str, category: str = None):
     # Defer the response immediately to avoid timeout
     await interaction.response.defer(thinking=True)
 
@@ -530,7 +757,10 @@ async def live(interaction: discord.Interaction, streamer_type: str):
         return
 
     # Extract broadcaster IDs and names
-    live_streams = []
+    live_streams = {}  # category -> formatted lines
+    category_ids = game_ids_named(category) if category else None
+    snapshot_fresh = time.time() - live_snapshot["taken_at"] < LIVE_SNAPSHOT_MAX_AGE
+    snapshot_polled = set(live_snapshot["polled"])
 
     # Process in batches of 100 (Twitch API limit)
     for i in range(0, len(approved), 100):
@@ -539,27 +769,42 @@ async def live(interaction: discord.Interaction, streamer_type: str):
         # Get IDs for this batch
         broadcaster_ids = [streamer.broadcaster_id for streamer in batch]
 
-        # Call our new function from twitchFuncs
-        result = get_multiple_streams(user_ids=broadcaster_ids)
+        if snapshot_fresh and snapshot_polled.issuperset(broadcaster_ids):
+            # The viewer sampler polled all of these moments ago
+            result = {"success": True, "data": [live_snapshot["streams"][broadcaster_id]
+                                                for broadcaster_id in broadcaster_ids
+                                                if broadcaster_id in live_snapshot["streams"]]}
+        else:
+            # Call our new function from twitchFuncs
+            result = await asyncio.to_thread(get_multiple_streams, user_ids=broadcaster_ids)
 
         if result["success"]:
+            await asyncio.to_thread(resolve_games, [stream.get("game_id") for stream in result["data"]])
             for stream in result["data"]:
+                if category_ids is not None and stream.get("game_id") not in category_ids:
+                    continue
                 # Format each live stream
                 stream_url = f"https://twitch.tv/{stream['user_login']}"
                 stream_title = stream['title']
                 viewer_count = stream['viewer_count']
-                live_streams.append(f"{stream_url} - {stream_title} ({viewer_count} viewers)")
+                stream_category = game_name(stream.get("game_id"), stream.get("game_name") or "No category")
+                live_streams.setdefault(stream_category, []).append(
+                    f"{stream_url} - {stream_title} ({viewer_count} viewers)")
 
     # Send the results
     if not live_streams:
-        await interaction.followup.send("No streamers are currently live.")
+        await interaction.followup.send(f"No streamers are currently live{f' in {category}' if category else ''}.")
         return
 
     # Split into chunks if too long
     message_chunks = []
     current_chunk = f"**Currently Live Streamers who are *{streamer_type.upper()}*:**\n"
 
-    for stream in live_streams:
+    lines = []
+    for stream_category in sorted(live_streams, key=str.lower):
+        lines.append(f"__**{stream_category}**__")
+        lines.extend(live_streams[stream_category])
+    for stream in lines:
         if len(current_chunk) + len(stream) + 2 > 2000:  # Discord message limit
             message_chunks.append(current_chunk)
             current_chunk = stream + "\n"
@@ -576,6 +821,256 @@ async def live(interaction: discord.Interaction, streamer_type: str):
     for chunk in message_chunks[1:]:
         await interaction.channel.send(chunk,suppress_embeds=True)
 
+@client.tree.command(name="stats", description="Viewer stats for a streamer over the last hours",
+                     guild=discord.Object(id=GUILD_ID))
+@app_commands.default_permissions(administrator=True)
+@app_commands.describe(
+    streamer="Twitch username or URL",
+    hours="How many hours back to look (default 24)")
+@app_commands.autocomplete(streamer=streamer_autocomplete)
+async def stats(interaction: discord.Interaction, streamer: str, hours: app_commands.Range[int, 1, 24 * 365] = 24):
+    """Shows peak, average viewers and hours live from the viewer rollups"""
+    if streamer.startswith("https://twitch.tv/") or streamer.startswith("https://www.twitch.tv/"):
+        streamer = streamer.split("/")[-1]
+    # Autocomplete and URLs give the login, which the display name need not match
+    known = await asyncio.to_thread(db_manager.get_by_login, interaction.guild_id, streamer)
+    if known:
+        broadcaster_id = known.broadcaster_id
+    else:
+        broadcaster_id = await asyncio.to_thread(lambda: TwitchStreamer(streamer, lazy=True, hedge=True).broadcaster_id)
+    if not broadcaster_id:
+        await interaction.response.send_message(f"⚠️ Could not find the streamer '{streamer}'.", ephemeral=True)
+        return
+
+    viewer_stats = await asyncio.to_thread(get_viewer_stats, broadcaster_id, hours)
+    if not viewer_stats["samples"]:
+        await interaction.response.send_message(f"No viewer data for **{streamer}** in the last {hours} hours.")
+        return
+    embed = discord.Embed(title=f"📈 {streamer} — last {hours} hours", color=discord.Color.purple())
+    embed.add_field(name="Peak Viewers", value=str(viewer_stats["peak"]), inline=True)
+    embed.add_field(name="Average Viewers", value=f"{viewer_stats['average']:.1f}", inline=True)
+    embed.add_field(name="Hours Live", value=f"{viewer_stats['hours_live']:.1f}", inline=True)
+    await interaction.response.send_message(embed=embed)
+
+TWITCH_LOGIN_PATTERN = re.compile(r"^[a-z0-9_]{1,25}$")
+IMPORT_HEADER_NAMES = {"login", "broadcaster_login", "broadcaster_name", "username", "streamer", "url"}
+
+def parse_streamer_login(value):
+    """Normalises a Twitch login or channel URL to a lowercase login, or None if it isn't one."""
+    value = value.strip().strip("/").lower()
+    if "twitch.tv/" in value:
+        value = value.split("twitch.tv/")[-1].split("/")[0].split("?")[0]
+    return value if TWITCH_LOGIN_PATTERN.match(value) else None
+
+async def stream_attachment_lines(attachment: discord.Attachment):
+    """Yields the attachment's text lines as they are downloaded instead of reading it all first."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(attachment.url) as response:
+            response.raise_for_status()
+            async for line in response.content:
+                yield line.decode("utf-8-sig", errors="ignore")
+
+class StreamersGroup(app_commands.Group):
+    """Bulk import and export of a server's streamer list"""
+
+    @app_commands.command(name="import", description="Import streamers from a CSV or newline list of logins/URLs")
+    @app_commands.describe(file="CSV (first column) or text file with one Twitch login or URL per line",
+                           status="Status given to imported streamers")
+    @app_commands.choices(status=[
+        app_commands.Choice(name="Approved", value="approved"),
+        app_commands.Choice(name="Pending", value="pending"),
+        app_commands.Choice(name="Rejected", value="rejected")
+    ])
+    async def import_streamers(self, interaction: discord.Interaction, file: discord.Attachment, status: str = "approved"):
+        """Resolves logins 100 at a time through Helix and upserts them in one transaction"""
+        await interaction.response.defer(thinking=True)
+        guild_id = str(interaction.guild_id)
+        entries = {}
+        seen = set()
+        skipped = 0
+        batch = []
+        first_row = True
+
+        async def hydrate_batch():
+            streamers = await asyncio.to_thread(hydrate_streamers, batch)
+            for info in streamers:
+                entries[info.broadcaster_id] = streamer_entry(guild_id, info, status)
+            batch.clear()
+            await interaction.edit_original_response(
+                content=f"⏳ Importing... resolved **{len(entries)}** of {len(seen)} logins so far.")
+
+        try:
+            async for line in stream_attachment_lines(file):
+                if not line.strip():
+                    continue
+                cell = next(csv.reader([line]), [""])[0]
+                # Only the first row can be a header; "streamer" further down is a real login
+                is_header = first_row and cell.strip().lower() in IMPORT_HEADER_NAMES
+                first_row = False
+                if is_header:
+                    continue
+                login = parse_streamer_login(cell)
+                if not login:
+                    skipped += 1
+                    continue
+                if login in seen:
+                    continue
+                seen.add(login)
+                batch.append(login)
+                if len(batch) == 100:
+                    await hydrate_batch()
+            if batch:
+                await hydrate_batch()
+        except aiohttp.ClientError as e:
+            await interaction.edit_original_response(content=f"⚠️ Could not download `{file.filename}`: {e}")
+            return
+
+        # Existing rows keep their approval message, everything else is refreshed
+        saved = await asyncio.to_thread(db_manager.upsert_entries, list(entries.values()), ("message_id",))
+        await interaction.edit_original_response(
+            content=f"✅ Imported **{saved}** streamers as `{status}`. "
+                    f"{len(seen) - len(entries)} logins not found on Twitch, {skipped} lines skipped.")
+
+    @app_commands.command(name="export", description="Export this server's streamer list as CSV")
+    async def export_streamers(self, interaction: discord.Interaction):
+        """Sends the guild's streamers as a CSV that /streamers import accepts"""
+        streamers = db_manager.get_all(Streamer, guild_id=str(interaction.guild_id))
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(["login", "broadcaster_id", "broadcaster_name", "status", "stream_url"])
+        for iStreamer in streamers:
+            writer.writerow([iStreamer.login, iStreamer.broadcaster_id, iStreamer.broadcaster_name, iStreamer.status,
+                             iStreamer.stream_url])
+        export = discord.File(io.BytesIO(output.getvalue().encode("utf-8")), filename=f"streamers-{interaction.guild_id}.csv")
+        await interaction.response.send_message(f"📄 Exported **{len(streamers)}** streamers.", file=export)
+
+client.tree.add_command(StreamersGroup(name="streamers", default_permissions=discord.Permissions(administrator=True)),
+                        guild=discord.Object(id=GUILD_ID))
+
+async def apply_review_decisions(guild_id, decisions, fallback_channel):
+    """Applies {broadcaster_id: status} decisions in one transaction, then broadcasts and cleans up in bulk."""
+    updated = await asyncio.to_thread(db_manager.apply_status_decisions, guild_id, decisions)
+    server_settings = get_channel_settings(str(guild_id))
+    approval_channel = broadcast_channel = None
+    if server_settings:
+        if server_settings.approval_channel_id:
+            approval_channel = client.get_channel(int(server_settings.approval_channel_id))
+        if server_settings.broadcast_channel_id:
+            broadcast_channel = client.get_channel(int(server_settings.broadcast_channel_id))
+
+    approved_logins = [row.login for row in updated if row.status == "approved"]
+    approved = []
+    for i in range(0, len(approved_logins), 100):
+        approved += await asyncio.to_thread(hydrate_streamers, approved_logins[i:i + 100])
+    await send_approved_broadcast_batch(broadcast_channel or fallback_channel, approved)
+    await delete_approval_messages(approval_channel, [row.message_id for row in updated])
+    return updated
+
+class PendingReviewView(discord.ui.View):
+    PAGE_SIZE = 25  # Discord's limit on select options
+
+    def __init__(self, guild_id, author_id):
+        super().__init__(timeout=300)
+        self.guild_id = str(guild_id)
+        self.author_id = author_id
+        self.current_page = 0
+        self.selected = set()
+        self.pending = []
+        self.select = None
+        self.reload()
+
+    def reload(self):
+        self.pending = sorted(db_manager.get_all(Streamer, guild_id=self.guild_id, status="pending"),
+                              key=lambda row: (row.broadcaster_name or "").lower())
+        self.current_page = max(0, min(self.current_page, (len(self.pending) - 1) // self.PAGE_SIZE))
+        self.selected.clear()
+        self.build_select()
+
+    def page_rows(self):
+        start = self.current_page * self.PAGE_SIZE
+        return self.pending[start:start + self.PAGE_SIZE]
+
+    def build_select(self):
+        if self.select:
+            self.remove_item(self.select)
+            self.select = None
+        rows = self.page_rows()
+        self.previous_button.disabled = self.current_page == 0
+        self.next_button.disabled = (self.current_page + 1) * self.PAGE_SIZE >= len(self.pending)
+        self.approve_button.disabled = self.reject_button.disabled = not rows
+        if not rows:
+            return
+        self.select = discord.ui.Select(
+            placeholder="Select streamers to approve or reject", min_values=0, max_values=len(rows), row=0,
+            options=[discord.SelectOption(label=(row.broadcaster_name or row.broadcaster_id)[:100],
+                                          value=row.broadcaster_id,
+                                          description=(row.title or "")[:100] or None) for row in rows])
+        self.select.callback = self.select_changed
+        self.add_item(self.select)
+
+    def render(self):
+        if not self.pending:
+            return "✅ No pending streamers left to review."
+        pages = (len(self.pending) - 1) // self.PAGE_SIZE + 1
+        lines = [f"**Pending review** — page {self.current_page + 1} of {pages} ({len(self.pending)} pending)"]
+        for row in self.page_rows():
+            mark = "☑️" if row.broadcaster_id in self.selected else "▫️"
+            lines.append(f"{mark} [{row.broadcaster_name}](<{row.stream_url}>) — {row.game_name or 'N/A'} · {row.viewers or 0} viewers")
+        return "\n".join(lines)[:2000]
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("⚠️ You can't control this review.", ephemeral=True)
+            return False
+        return True
+
+    async def select_changed(self, interaction: discord.Interaction):
+        self.selected = set(self.select.values)
+        await interaction.response.edit_message(content=self.render(), view=self)
+
+    async def decide(self, interaction: discord.Interaction, status):
+        if not self.selected:
+            await interaction.response.send_message("⚠️ Select at least one streamer first.", ephemeral=True)
+            return
+        await interaction.response.defer()
+        updated = await apply_review_decisions(self.guild_id, dict.fromkeys(self.selected, status), interaction.channel)
+        self.reload()
+        await interaction.edit_original_response(
+            content=f"{'✅' if status == 'approved' else '❌'} {len(updated)} streamers {status}.\n\n{self.render()}", view=self)
+
+    @discord.ui.button(label="⬅️", style=discord.ButtonStyle.secondary, row=1)
+    async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.current_page -= 1
+        self.selected.clear()
+        self.build_select()
+        await interaction.response.edit_message(content=self.render(), view=self)
+
+    @discord.ui.button(label="Approve selected", style=discord.ButtonStyle.green, row=1)
+    async def approve_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.decide(interaction, "approved")
+
+    @discord.ui.button(label="Reject selected", style=discord.ButtonStyle.red, row=1)
+    async def reject_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.decide(interaction, "rejected")
+
+    @discord.ui.button(label="➡️", style=discord.ButtonStyle.secondary, row=1)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.current_page += 1
+        self.selected.clear()
+        self.build_select()
+        await interaction.response.edit_message(content=self.render(), view=self)
+
+class PendingGroup(app_commands.Group):
+    """Reviews the pending approval backlog"""
+
+    @app_commands.command(name="review", description="Page through pending streamers and approve or reject them in bulk")
+    async def review(self, interaction: discord.Interaction):
+        view = PendingReviewView(interaction.guild_id, interaction.user.id)
+        await interaction.response.send_message(view.render(), view=view, suppress_embeds=True)
+
+client.tree.add_command(PendingGroup(name="pending", default_permissions=discord.Permissions(administrator=True)),
+                        guild=discord.Object(id=GUILD_ID))
+
 class TagGroup(app_commands.Group):
     """Manages tracked search tags with subcommands"""
 
@@ -586,24 +1081,27 @@ class TagGroup(app_commands.Group):
         tags_list = db_manager.get_one(SearchTags, guild_id=guild_id)
 
         if not tags_list:
-            tags_list = SearchTags(guild_id=guild_id, search_tags=[tag])
-            db_manager.add_entry(tags_list)
+            tags_list = SearchTags(guild_id=guild_id, search_tags=[])
         else:
             if len(tags_list.search_tags) >= 5:
                 await interaction.response.send_message(
                     "⚠️ You can only track **5 tags max**. Use `/tag list` to review your current tags. Remove tags with `/tag remove <tag>`.",
                     ephemeral=True)
                 return
-            if tag in tags_list.search_tags:
+            # Tags match case-insensitively, as the scan scheduler keys them
+            if normalize_tag(tag) in {normalize_tag(t) for t in tags_list.search_tags}:
                 await interaction.response.send_message(f"⚠️ The tag '{tag}' is already being tracked.",
                                                         ephemeral=True)
                 return
 
         updated_tags = tags_list.search_tags + [tag]
         tags_list.search_tags = updated_tags
+        # add_entry commits and closes the session, which expires tags_list
+        search_interval = tags_list.search_interval
         db_manager.add_entry(tags_list)
+        # Due right away, check_for_new_streamers picks it up on its next tick
+        scan_scheduler.add_tag(guild_id, tag, search_interval)
         await interaction.response.send_message(f"✅ `{tag}` has been **added**.")
-        check_for_new_streamers.restart()
 
 
     @app_commands.command(name="remove", description="Remove a tracked tag")
@@ -612,15 +1110,34 @@ class TagGroup(app_commands.Group):
         guild_id = str(interaction.guild_id)
         tags_list = db_manager.get_one(SearchTags, guild_id=guild_id)
 
-        if tags_list and tag in tags_list.search_tags:
-            updated_tags = [t for t in tags_list.search_tags if t != tag]
+        tracked = {normalize_tag(t) for t in tags_list.search_tags} if tags_list else set()
+        if normalize_tag(tag) in tracked:
+            # Drops every spelling of the tag, the scheduler only ever had one entry for them
+            updated_tags = [t for t in tags_list.search_tags if normalize_tag(t) != normalize_tag(tag)]
             tags_list.search_tags = updated_tags
             db_manager.add_entry(tags_list)
             await interaction.response.send_message(f"✅ `{tag}` has been **removed**.")
         else:
             await interaction.response.send_message(f"⚠️ The tag '{tag}' isn't being tracked.", ephemeral=True)
             return
-        check_for_new_streamers.restart()
+        scan_scheduler.remove_tag(guild_id, tag)
+
+    @remove.autocomplete("tag")
+    async def remove_tag_autocomplete(self, interaction: discord.Interaction, current: str):
+        """Suggests the guild's tracked tags from the in-memory index"""
+        return [app_commands.Choice(name=tag[:100], value=tag)
+                for tag in autocomplete_index.search_tags(interaction.guild_id, current)]
+
+    @app_commands.command(name="interval", description="Set how often tracked tags are scanned")
+    @app_commands.describe(minutes="Minutes between scans of each tag")
+    async def interval(self, interaction: discord.Interaction, minutes: app_commands.Range[int, 5, 1440]):
+        """Sets the server's search interval"""
+        guild_id = str(interaction.guild_id)
+        tags_list = db_manager.get_one(SearchTags, guild_id=guild_id) or SearchTags(guild_id=guild_id, search_tags=[])
+        tags_list.search_interval = minutes
+        db_manager.add_entry(tags_list)
+        scan_scheduler.set_interval(guild_id, minutes)
+        await interaction.response.send_message(f"✅ Tags will be scanned every **{minutes}** minutes.")
 
     @app_commands.command(name="list", description="List all tracked tags")
     async def list(self, interaction: discord.Interaction):
@@ -633,36 +1150,154 @@ class TagGroup(app_commands.Group):
 
 client.tree.add_command(TagGroup(name="tag"),guild=discord.Object(id=GUILD_ID))
 
-@tasks.loop(minutes=10)
-async def check_for_new_streamers():
-    """Runs every 10 minutes to search for streamers and add them to pending."""
-    logging.info(f"🔎 Checking for new streamers...{datetime.now()}")
-
-    guilds = db_manager.get_all(SearchTags)
-    logging.info(f"🔎 Found {len(guilds)} guilds to check.")
-
-    for guild in guilds:
-        guild_id = guild.guild_id
-        tags = guild.search_tags if guild else []
-        logging.info(tags)
-        for iTag in tags:
-            logging.info(f"🔎 Searching for streamers with tag: {iTag}")
-
-            new_streamers, total_streamers = await search_live_channel_by_tag(iTag)
-
-            if total_streamers > 0:
-                approval_channel = db_manager.get_one(ServerSettings, guild_id=guild_id)
+@client.tree.command(name="profile", description="Profile the next discovery cycle (CPU and allocations)",
+                     guild=discord.Object(id=GUILD_ID))
+@app_commands.default_permissions(administrator=True)
+async def profile(interaction: discord.Interaction):
+    """Arms the profiler for the next check_for_new_streamers cycle"""
+    if cycle_profiler.arm():
+        await interaction.response.send_message(
+            f"⏱️ The next discovery cycle will be profiled. Reports will be written to `{cycle_profiler.output_dir}/`.",
+            ephemeral=True)
+    else:
+        await interaction.response.send_message("⚠️ A profiled cycle is already running.", ephemeral=True)
 
-                if approval_channel:
-                    channel = client.get_channel(int(approval_channel.approval_channel_id))
-                    if not channel:
-                        logging.info(f"⚠️ Could not find approval channel for guild {guild_id}")
-                        continue
+@client.tree.command(name="health", description="Shows the state of the Twitch circuit breakers",
+                     guild=discord.Object(id=GUILD_ID))
+@app_commands.default_permissions(administrator=True)
+async def health(interaction: discord.Interaction):
+    """Lists every endpoint's circuit breaker with its failure count"""
+    states = breaker_states()
+    if not states:
+        await interaction.response.send_message("No Twitch calls made yet.", ephemeral=True)
+        return
+    icons = {"closed": "🟢", "half_open": "🟡", "open": "🔴"}
+    lines = []
+    for endpoint, status in sorted(states.items()):
+        retry = f", retrying in {status['retry_in']:.0f}s" if status["state"] == "open" else ""
+        lines.append(f"{icons[status['state']]} `{endpoint}` — {status['state']} ({status['failures']} failures{retry})")
+    await interaction.response.send_message("\n".join(lines), ephemeral=True)
+
+async def deliver_discovered(discovered):
+    """Sends discovered (guild_id, broadcaster_login, tag) tuples to each guild's approval channel.
+
+    Returns how many new pending streamers each (guild_id, lower-cased tag) produced, and the set of tuples
+    whose delivery failed and should be retried.
+    """
+    channels = {}
+    new_found = {}
+    failed = set()
+    # Twitch lookups are batched and kept off the event loop, the loop itself only does Discord I/O
+    logins = sorted({broadcaster_login.lower() for _, broadcaster_login, _ in discovered})
+    streamers = {}
+    unavailable = set()
+    for i in range(0, len(logins), 100):
+        batch = logins[i:i + 100]
+        hydrated = await asyncio.to_thread(hydrate_streamers, batch)
+        if not hydrated:
+            # Helix is down or every lookup failed; retried rather than dropped
+            unavailable.update(batch)
+        streamers.update({info.broadcaster_login.lower(): info for info in hydrated})
+    for guild_id, broadcaster_login, tag in discovered:
+        if broadcaster_login.lower() in unavailable:
+            failed.add((guild_id, broadcaster_login, tag))
+            continue
+        info = streamers.get(broadcaster_login.lower())
+        if not info:
+            logging.info(f"⚠️ {broadcaster_login} is no longer on Twitch, skipping")
+            continue
+        if guild_id not in channels:
+            approval_channel = db_manager.get_one(ServerSettings, guild_id=guild_id)
+            channels[guild_id] = client.get_channel(int(approval_channel.approval_channel_id)) \
+                if approval_channel and approval_channel.approval_channel_id else None
+            if not channels[guild_id]:
+                logging.info(f"⚠️ Could not find approval channel for guild {guild_id}")
+        channel = channels[guild_id]
+        if not channel:
+            continue
+        try:
+            if await add_pending_approval(channel, guild_id, info):
+                new_found[(guild_id, tag.lower())] = new_found.get((guild_id, tag.lower()), 0) + 1
+        except Exception as e:
+            # A missing permission in one guild must not stop the others' deliveries
+            logging.error(f"⚠️ Could not post {broadcaster_login} for approval in guild {guild_id}: {e}")
+            failed.add((guild_id, broadcaster_login, tag))
+    return new_found, failed
 
-                    for found in new_streamers:
-                        print(found['data'])
-                        broadcaster_login = found['data']['broadcaster_login']
-                        await add_pending_approval(channel,guild_id,broadcaster_login)
-        logging.info("*** SEARCH COMPLETED ***")
+@tasks.loop(seconds=30)
+async def check_for_new_streamers():
+    """Scans the (guild, tag) entries the scan scheduler says are due and adds new streamers to pending."""
+    due = scan_scheduler.pop_due()
+    if not due:
+        return
+    logging.info(f"🔎 Checking for new streamers...{datetime.now()} ({len(due)} scans due)")
 
-client.run(TOKEN)
\ No newline at end of file
+    new_found = {}
+    try:
+        async with cycle_profiler.profile("check_for_new_streamers"):
+            discovered = await scan_tags(due_by_tag(due))
+            new_found, _ = await deliver_discovered(discovered)
+            logging.info("*** SEARCH COMPLETED ***")
+    except Exception as e:
+        # tasks.loop stops for good on most exceptions; the failed scans back off and are retried
+        logging.error(f"⚠️ Discovery cycle failed: {e}")
+    finally:
+        # Popped entries must go back on the queue even if the cycle failed; a failure backs them off
+        for entry in due:
+            scan_scheduler.record_result(entry, new_found.get((entry.guild_id, entry.tag.lower()), 0))
+
+@tasks.loop(seconds=30)
+async def drain_discovery_outbox():
+    """Posts streamers found by the discovery worker processes (DISCOVERY_MODE=worker)."""
+    shard_ids = sorted(client.shards) if SHARD_COUNT else None
+    try:
+        while claimed := db_manager.claim_discovered(limit=100, shard_ids=shard_ids):
+            _, failed = await deliver_discovered(list(claimed.values()))
+            # Failed rows keep their lease and are retried once it runs out
+            db_manager.finish_discovered([row_id for row_id, row in claimed.items() if row not in failed])
+    except Exception as e:
+        # Undelivered rows stay in the outbox; the loop must survive to retry them
+        logging.error(f"⚠️ Draining the discovery outbox failed: {e}")
+
+@tasks.loop(minutes=1)
+async def sample_live_viewers():
+    """Records a viewer sample for every approved streamer that is live right now."""
+    broadcaster_ids = sorted({s.broadcaster_id for s in db_manager.get_all(Streamer, status="approved")
+                              if owns_guild(s.guild_id)})
+    live_streams = []
+    # Process in batches of 100 (Twitch API limit)
+    for i in range(0, len(broadcaster_ids), 100):
+        result = await asyncio.to_thread(get_multiple_streams, user_ids=broadcaster_ids[i:i + 100])
+        if result["success"]:
+            live_streams.extend(result["data"])
+    live_snapshot.update(taken_at=time.time(), polled=broadcaster_ids,
+                         streams={stream["user_id"]: stream for stream in live_streams})
+    await asyncio.to_thread(resolve_games, [stream.get("game_id") for stream in live_streams])
+    await asyncio.to_thread(record_viewer_samples, live_streams)
+
+@tasks.loop(minutes=15)
+async def roll_up_viewer_stats():
+    """Rolls viewer samples up into hourly and daily buckets."""
+    await asyncio.to_thread(roll_up_viewer_samples)
+
+@tasks.loop(minutes=5)
+async def refresh_streamers():
+    """Low-priority refresh of the stalest Broadcaster rows, off the event loop."""
+    guild_ids = [guild.id for guild in client.guilds] if SHARD_COUNT else None
+    await asyncio.to_thread(refresh_stale_streamers, guild_ids=guild_ids)
+
+@tasks.loop(minutes=5)
+async def save_state_snapshot():
+    """Persists caches and live state so a restart can start warm."""
+    await asyncio.to_thread(save_snapshot)
+
+register_snapshot("helix_users", dump_user_cache, load_user_cache, ttl=USER_CACHE_TTL)
+register_snapshot("live_snapshot", lambda: dict(live_snapshot), live_snapshot.update, ttl=LIVE_SNAPSHOT_MAX_AGE)
+register_snapshot("scan_cursors", lambda: dict(last_scanned), last_scanned.update, ttl=SCAN_CURSOR_TTL)
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    client.run(TOKEN)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Discovery worker: scans tracked tags outside the bot process and hands the streamers it finds to the
+bot through the discovery_outbox table.
+
+Run the bot with DISCOVERY_MODE=worker, then start one or more workers:
+
+    python discoveryWorker.py [--workers N] [--tick SECONDS]
+
+Each worker schedules its scans with a ScanScheduler, honouring every guild's search interval. With several
+workers each one owns a stable share of the tracked tags. When the bot is sharded, give the workers the same
+SHARD_COUNT so each bot process only drains rows for its own guilds.
+"""
+import argparse, asyncio, logging, multiprocessing, time, zlib
+
+# Establish Environmental Variables before the modules that read them
+from dotenv import load_dotenv
+load_dotenv()
+
+from database import db_manager, engine, init_db, SearchTags
+from scanScheduler import ScanScheduler
+from sharding import SHARD_COUNT
+from twitchFuncs import normalize_tag, search_live_channels_by_tags
+
+def owns_tag(tag, worker_index=0, worker_count=1):
+    return zlib.crc32(tag.lower().encode()) % worker_count == worker_index
+
+# Scan cursors: lower-cased tag -> unix time of its last completed scan
+last_scanned = {}
+
+def due_by_tag(entries):
+    """Groups due ScanEntries by normalised tag: {tag key: (tag, guild ids)}."""
+    guilds_by_tag = {}
+    for entry in entries:
+        guilds_by_tag.setdefault(normalize_tag(entry.tag), (entry.tag, set()))[1].add(entry.guild_id)
+    return guilds_by_tag
+
+async def scan_tags(guilds_by_tag):
+    """Scans each tag's directory once and returns (guild_id, broadcaster_login, tag) tuples for every guild
+    tracking it.
+
+    Every page load is matched against all the due tags, so a streamer carrying several tracked tags is
+    found for each of them even when it only shows up on one tag's page.
+    """
+    logins_by_tag = {}
+    for key, (tag, _) in guilds_by_tag.items():
+        logging.info(f"🔎 Searching for streamers with tag: {tag}")
+        matches = await search_live_channels_by_tags(guilds_by_tag.keys(), page_tag=tag)
+        last_scanned[key] = time.time()
+        for matched, channels in matches.items():
+            logins_by_tag.setdefault(matched, set()).update(channel["broadcaster_login"] for channel in channels)
+    discovered = []
+    for key, logins in logins_by_tag.items():
+        tag, guild_ids = guilds_by_tag[key]
+        for guild_id in guild_ids:
+            discovered.extend((guild_id, broadcaster_login, tag) for broadcaster_login in logins)
+    return discovered
+
+async def run_cycle(scheduler, worker_index=0, worker_count=1):
+    scheduler.sync(db_manager.get_all(SearchTags), last_scanned,
+                   owns=lambda guild_id, tag: owns_tag(tag, worker_index, worker_count))
+    due = scheduler.pop_due()
+    if not due:
+        return
+    # Scans adapt on new streamers only, so streamers the guild already tracks are dropped here
+    found = {}
+    try:
+        scanned = await scan_tags(due_by_tag(due))
+        known = db_manager.known_logins({entry.guild_id for entry in due})
+        discovered = [(guild_id, broadcaster_login, tag) for guild_id, broadcaster_login, tag in scanned
+                      if broadcaster_login.lower() not in known.get(str(guild_id), ())]
+        db_manager.enqueue_discovered(discovered, shard_count=SHARD_COUNT)
+        for guild_id, _, tag in discovered:
+            found[(guild_id, tag.lower())] = found.get((guild_id, tag.lower()), 0) + 1
+        logging.info(f"*** WORKER {worker_index} SEARCH COMPLETED ({len(discovered)} found) ***")
+    finally:
+        # Popped entries must go back on the queue even if the cycle failed; a failure backs them off
+        for entry in due:
+            scheduler.record_result(entry, found.get((entry.guild_id, entry.tag.lower()), 0))
+
+def run_worker(worker_index=0, worker_count=1, tick=30):
+    logging.basicConfig(level=logging.INFO)
+    logging.info(f"🛠️ Discovery worker {worker_index + 1}/{worker_count} started")
+    scheduler = ScanScheduler()
+    while True:
+        try:
+            asyncio.run(run_cycle(scheduler, worker_index, worker_count))
+        except Exception as e:
+            logging.error(f"⚠️ Discovery cycle failed: {e}")
+        time.sleep(tick)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Twitch tag discovery outside the bot process.")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--tick", type=float, default=30, help="seconds between checks for due scans")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+
+    if args.workers <= 1:
+        run_worker(0, 1, args.tick)
+        return
+    # Connections opened by init_db must not be shared with forked workers; each child opens its own
+    engine.dispose()
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(index, args.workers, args.tick), name=f"discovery-{index}")
+        for index in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+if __name__ == '__main__':
+    main()
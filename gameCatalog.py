@@ -0,0 +1,59 @@
+"""Local catalog of Twitch games (categories).
+
+Game names are kept in memory and in the `games` table. Game IDs seen on streams, channels or Streamer
+rows go through resolve_games(), which looks up only the IDs not in the catalog yet, in bulk /helix/games
+calls of up to 100 IDs. Filtering and grouping by category then never needs another Helix request.
+"""
+import logging, threading
+
+from database import db_manager, Game
+from twitchFuncs import get_games
+
+_games = {}  # game_id -> name
+_unknown = set()  # IDs /helix/games did not return, not asked for again until restart
+_lock = threading.Lock()
+
+def load_game_catalog():
+    """Fills the in-memory catalog from the games table."""
+    with _lock:
+        _games.update({game.game_id: game.name for game in db_manager.get_all(Game)})
+    logging.info(f"🎮 Loaded {len(_games)} games into the catalog")
+
+def resolve_games(game_ids):
+    """Adds the names of any unseen `game_ids` to the catalog. Returns how many games were added."""
+    with _lock:
+        unseen = sorted({str(game_id) for game_id in game_ids if game_id} - _games.keys() - _unknown)
+    if not unseen:
+        return 0
+    games = []
+    for i in range(0, len(unseen), 100):
+        batch = unseen[i:i + 100]
+        result = get_games(batch)
+        if not result["success"]:
+            # Retried the next time these IDs show up
+            continue
+        games.extend({"game_id": game["id"], "name": game["name"], "box_art_url": game.get("box_art_url")}
+                     for game in result["data"])
+        _unknown.update(set(batch) - {game["id"] for game in result["data"]})
+    if games:
+        names = {game["game_id"]: game["name"] for game in games}
+        db_manager.upsert_rows(Game, games)
+        with _lock:
+            _games.update(names)
+        logging.info(f"🎮 Added {len(games)} games to the catalog")
+    return len(games)
+
+def game_name(game_id, default=None):
+    return _games.get(str(game_id), default) if game_id else default
+
+def game_ids_named(name):
+    """IDs of the catalog games whose name matches `name`, ignoring case."""
+    name = (name or "").lower()
+    return {game_id for game_id, game in list(_games.items()) if game.lower() == name}
+
+def search_games(current, limit=25):
+    """Catalog game names containing `current`, prefix matches first."""
+    current = (current or "").lower()
+    names = sorted({name for name in list(_games.values()) if current in name.lower()})
+    names.sort(key=lambda name: not name.lower().startswith(current))
+    return names[:limit]
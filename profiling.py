@@ -0,0 +1,133 @@
+import asyncio, cProfile, contextlib, io, logging, os, pstats, signal, sys, threading, time, traceback, tracemalloc
+from datetime import datetime
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "25"))
+SLOW_CALLBACK_THRESHOLD = float(os.getenv("SLOW_CALLBACK_THRESHOLD", "0.25"))
+
+class CycleProfiler:
+    """Profiles the next armed cycle with cProfile and tracemalloc and writes the reports to disk."""
+
+    def __init__(self, output_dir=PROFILE_DIR, top_n=PROFILE_TOP_N):
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.armed = False
+        self.running = False
+
+    def arm(self):
+        """Marks the next cycle to be profiled."""
+        if self.running:
+            logging.info("⏱️ A profiled cycle is already running, ignoring request")
+            return False
+        self.armed = True
+        logging.info("⏱️ Profiler armed for the next cycle")
+        return True
+
+    def install_signal_handler(self, loop, sig=getattr(signal, "SIGUSR1", None)):
+        """Arms the profiler when the process receives `sig` (SIGUSR1 by default)."""
+        if sig is None:
+            return
+        try:
+            loop.add_signal_handler(sig, self.arm)
+            logging.info(f"⏱️ Send {sig.name} to pid {os.getpid()} to profile the next cycle")
+        except (NotImplementedError, RuntimeError) as e:
+            logging.warning(f"⚠️ Could not install profiler signal handler: {e}")
+
+    @contextlib.asynccontextmanager
+    async def profile(self, label):
+        """Runs the wrapped block under the profiler if armed, otherwise does nothing."""
+        if not self.armed:
+            yield
+            return
+        self.armed = False
+        self.running = True
+        started_tracemalloc = not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start(25)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - started
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracemalloc:
+                tracemalloc.stop()
+            self.running = False
+            try:
+                self.write_reports(label, profiler, snapshot, elapsed)
+            except OSError as e:
+                logging.error(f"⚠️ Failed to write profile for {label}: {e}")
+
+    def write_reports(self, label, profiler, snapshot, elapsed):
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(self.output_dir, f"{label}-{stamp}")
+
+        profiler.dump_stats(f"{base}.prof")
+
+        stats_text = io.StringIO()
+        pstats.Stats(profiler, stream=stats_text).sort_stats("cumulative").print_stats(self.top_n)
+
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        with open(f"{base}-report.txt", "w", encoding="utf-8") as report:
+            report.write(f"{label} took {elapsed:.2f}s\n\n")
+            report.write(f"Top {self.top_n} allocations by line:\n")
+            for stat in snapshot.statistics("lineno")[:self.top_n]:
+                report.write(f"{stat}\n")
+            report.write(f"\nTop {self.top_n} functions by cumulative time:\n")
+            report.write(stats_text.getvalue())
+        logging.info(f"⏱️ Profile for {label} written to {base}.prof ({elapsed:.2f}s)")
+
+
+class LoopWatchdog:
+    """Logs the event loop's stack whenever it stays blocked for longer than `threshold` seconds."""
+
+    def __init__(self, threshold=SLOW_CALLBACK_THRESHOLD):
+        self.threshold = threshold
+        self.interval = threshold / 2
+        self.loop = None
+        self.loop_thread_id = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._pending_since = None
+        self._reported = False
+
+    def start(self, loop=None):
+        """Starts watching `loop`; must be called from the loop's own thread."""
+        if self._thread:
+            return
+        self.loop = loop or asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logging.info(f"🐕 Event loop watchdog started (threshold {self.threshold}s)")
+
+    def stop(self):
+        self._stop.set()
+
+    def _heartbeat(self):
+        self._pending_since = None
+        self._reported = False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+                try:
+                    self.loop.call_soon_threadsafe(self._heartbeat)
+                except RuntimeError:
+                    # Loop has been closed
+                    return
+                continue
+            blocked_for = time.monotonic() - self._pending_since
+            if blocked_for >= self.threshold and not self._reported:
+                self._reported = True
+                frame = sys._current_frames().get(self.loop_thread_id)
+                stack = "".join(traceback.format_stack(frame)) if frame else "<no frame>"
+                logging.warning(f"🐢 Event loop blocked for {blocked_for:.2f}s, current stack:\n{stack}")
@@ -0,0 +1,36 @@
+"""Coalescing queue for approval reactions.
+
+Reactions are keyed by message ID. The first decision for a message is kept and any later reaction on the
+same message, a duplicate or a conflicting one, is dropped until the batch holding it has been applied.
+Two moderators reacting at the same moment therefore produce a single decision.
+"""
+import logging
+
+class CoalescingQueue:
+    def __init__(self):
+        self._pending = {}  # key -> item, in arrival order
+        self._in_flight = set()  # keys taken by take() and not yet marked done()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def push(self, key, item):
+        """Queues `item` under `key` unless that key is already queued or being applied. Returns whether it was queued."""
+        if key in self._pending or key in self._in_flight:
+            current = self._pending.get(key)
+            if current is not None and current != item:
+                logging.info(f"🗳️ Ignoring conflicting reaction on message {key}, first decision wins")
+            return False
+        self._pending[key] = item
+        return True
+
+    def take(self, limit=100):
+        """Removes and returns up to `limit` of the oldest (key, item) pairs; hand their keys back to done()."""
+        batch = []
+        for key in list(self._pending)[:limit]:
+            batch.append((key, self._pending.pop(key)))
+            self._in_flight.add(key)
+        return batch
+
+    def done(self, keys):
+        self._in_flight.difference_update(keys)
@@ -0,0 +1,164 @@
+"""Timeouts, retries, circuit breakers and hedged requests for calls to Twitch.
+
+Every Helix endpoint and the tag scraper get their own CircuitBreaker. After BREAKER_FAILURE_THRESHOLD
+consecutive failed calls a breaker opens and calls fail fast with CircuitOpenError for BREAKER_RESET_SECONDS;
+then a single trial call is let through and its outcome closes or re-opens the breaker. A call counts once
+however many retries it took, and running out of retries on 429s is back-pressure, not a failure.
+
+resilient_get() blocks while it retries or hedges, so call it from a worker thread (asyncio.to_thread) when
+on the event loop.
+
+resilient_get() adds a timeout to every GET, retries timeouts, connection errors, 429 and 5xx responses
+with jittered exponential backoff, and with hedge=True sends a second copy of a request that has not
+answered within HEDGE_AFTER seconds, returning whichever answers first.
+"""
+import logging, os, random, threading, time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "8"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+HEDGE_AFTER = float(os.getenv("HEDGE_AFTER", "1.5"))
+
+HTTP_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling an endpoint whose breaker is open."""
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_seconds=BREAKER_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go out now; while half-open only one trial call is let through."""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                logging.info(f"🔌 Circuit '{self.name}' half-open, sending a trial request")
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                logging.info(f"🔌 Circuit '{self.name}' closed")
+            self.state = "closed"
+            self.failures = 0
+            self.trial_running = False
+
+    def release(self):
+        """Ends a call that says nothing about the endpoint's health (rate limited) without recording it."""
+        with self._lock:
+            self.trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                logging.error(f"🔌 Circuit '{self.name}' opened after {self.failures} failures")
+
+    def status(self):
+        """State of the breaker for monitoring."""
+        with self._lock:
+            retry_in = max(0, self.reset_seconds - (time.monotonic() - self.opened_at)) if self.state == "open" else 0
+            return {"state": self.state, "failures": self.failures, "retry_in": retry_in}
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def breaker_for(name):
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+def breaker_states():
+    """{endpoint: status()} for every breaker created so far."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.status() for breaker in breakers}
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, or the server's Retry-After if it asked for one."""
+    if retry_after is not None:
+        return min(retry_after, RETRY_MAX_DELAY)
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+_hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+def _hedged_get(url, **kwargs):
+    """Sends a second copy of the GET if the first has not answered within HEDGE_AFTER seconds."""
+    first = _hedge_pool.submit(requests.get, url, **kwargs)
+    done, _ = wait([first], timeout=HEDGE_AFTER)
+    if done:
+        return first.result()
+    logging.info(f"🐇 Hedging slow request to {url}")
+    pending = {first, _hedge_pool.submit(requests.get, url, **kwargs)}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None or not pending:
+                for other in pending:
+                    other.cancel()
+                return future.result()
+
+def resilient_get(url, endpoint, hedge=False, **kwargs):
+    """GET through `endpoint`'s circuit breaker with a timeout and jittered retries.
+
+    Raises requests exceptions like requests.get() does, including CircuitOpenError while the breaker is
+    open, so callers keep their existing error handling.
+    """
+    breaker = breaker_for(endpoint)
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    if not breaker.allow():
+        raise CircuitOpenError(f"Circuit '{endpoint}' is open, not calling {url}")
+    # The breaker gets one outcome for the whole call, not one per attempt
+    for attempt in range(HTTP_RETRIES + 1):
+        retry_after = None
+        try:
+            response = _hedged_get(url, **kwargs) if hedge else requests.get(url, **kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            error = e
+        except Exception:
+            # Not retried, but still an outcome: a half-open breaker must not wait on it forever
+            breaker.record_failure()
+            raise
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                # Anything else, 4xx included, means the endpoint itself is answering
+                breaker.record_success()
+                return response
+            error = requests.exceptions.HTTPError(f"{response.status_code} from {url}", response=response)
+            if response.headers.get("Retry-After", "").isdigit():
+                retry_after = int(response.headers["Retry-After"])
+        if attempt < HTTP_RETRIES:
+            delay = backoff_delay(attempt, retry_after)
+            logging.warning(f"⚠️ {endpoint} request failed ({error}), retry {attempt + 1} in {delay:.2f}s")
+            time.sleep(delay)
+    if isinstance(error, requests.exceptions.HTTPError) and error.response.status_code == 429:
+        # Twitch is up and asking us to slow down
+        breaker.release()
+    else:
+        breaker.record_failure()
+    raise error
@@ -0,0 +1,121 @@
+"""Per-guild tag scan scheduler.
+
+Holds a priority queue of (next_run, guild_id, tag) entries. Each entry starts at its guild's
+SearchTags.search_interval and adapts: a scan that finds new streamers snaps the entry back to the
+configured interval, a scan that finds nothing backs it off up to MAX_BACKOFF times the interval.
+Tag edits add or remove single entries instead of restarting the whole loop.
+"""
+import heapq, itertools, logging, os, time
+
+DEFAULT_SEARCH_INTERVAL = int(os.getenv("DEFAULT_SEARCH_INTERVAL", "10"))  # minutes
+MAX_BACKOFF = float(os.getenv("SCAN_MAX_BACKOFF", "4"))
+BACKOFF_FACTOR = 1.5
+
+class ScanEntry:
+    __slots__ = ("guild_id", "tag", "base_interval", "interval", "next_run")
+
+    def __init__(self, guild_id, tag, base_interval, next_run):
+        self.guild_id = guild_id
+        self.tag = tag
+        self.base_interval = base_interval
+        self.interval = base_interval
+        self.next_run = next_run
+
+class ScanScheduler:
+    def __init__(self):
+        self._heap = []  # (next_run, sequence, key); stale items are skipped when popped
+        self._entries = {}  # (guild_id, lower-cased tag) -> ScanEntry
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _key(guild_id, tag):
+        return str(guild_id), tag.lower()
+
+    @staticmethod
+    def interval_seconds(search_interval):
+        return (search_interval or DEFAULT_SEARCH_INTERVAL) * 60
+
+    def _push(self, key, entry):
+        heapq.heappush(self._heap, (entry.next_run, next(self._sequence), key))
+
+    def add_tag(self, guild_id, tag, search_interval=None, next_run=None):
+        """Schedules `tag` for `guild_id`, by default right away."""
+        key = self._key(guild_id, tag)
+        if key in self._entries:
+            return
+        entry = ScanEntry(str(guild_id), tag, self.interval_seconds(search_interval),
+                          next_run if next_run is not None else time.time())
+        self._entries[key] = entry
+        self._push(key, entry)
+
+    def remove_tag(self, guild_id, tag):
+        # The heap item stays behind and is dropped when it reaches the top
+        self._entries.pop(self._key(guild_id, tag), None)
+
+    def set_interval(self, guild_id, search_interval):
+        """Changes a guild's configured interval; entries keep their next run but adopt the new base."""
+        for (entry_guild, _), entry in self._entries.items():
+            if entry_guild == str(guild_id):
+                entry.base_interval = entry.interval = self.interval_seconds(search_interval)
+
+    def sync(self, search_tags, last_scanned=None, owns=lambda guild_id, tag: True):
+        """Brings the queue in line with SearchTags rows, touching only entries that changed.
+
+        `last_scanned` maps lower-cased tags to their last scan time so restored cursors delay the first run,
+        and `owns(guild_id, tag)` limits the queue to the entries this process is responsible for.
+        """
+        last_scanned = last_scanned or {}
+        wanted = {}
+        for row in search_tags:
+            for tag in row.search_tags or []:
+                if owns(row.guild_id, tag):
+                    wanted[self._key(row.guild_id, tag)] = (tag, row.search_interval)
+        for key in set(self._entries) - set(wanted):
+            self.remove_tag(*key)
+        for key, (tag, search_interval) in wanted.items():
+            entry = self._entries.get(key)
+            if entry is None:
+                interval = self.interval_seconds(search_interval)
+                self.add_tag(key[0], tag, search_interval, next_run=last_scanned.get(key[1], 0) + interval)
+            elif entry.base_interval != self.interval_seconds(search_interval):
+                entry.base_interval = entry.interval = self.interval_seconds(search_interval)
+
+    def pop_due(self, now=None):
+        """Removes and returns the entries due by `now`; hand each back through record_result()."""
+        now = now if now is not None else time.time()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            next_run, _, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is None or entry.next_run != next_run:
+                continue
+            due.append(entry)
+        return due
+
+    def record_result(self, entry, new_found, now=None):
+        """Reschedules a popped entry, adapting its interval to whether the scan found new streamers."""
+        now = now if now is not None else time.time()
+        key = self._key(entry.guild_id, entry.tag)
+        if self._entries.get(key) is not entry:
+            # Removed or replaced while it was being scanned
+            return
+        if new_found:
+            entry.interval = entry.base_interval
+        else:
+            entry.interval = min(entry.interval * BACKOFF_FACTOR, entry.base_interval * MAX_BACKOFF)
+        entry.next_run = now + entry.interval
+        self._push(key, entry)
+        logging.info(f"🗓️ Next scan of '{entry.tag}' for guild {entry.guild_id} in {entry.interval / 60:.1f} minutes")
+
+    def seconds_until_next(self, now=None):
+        now = now if now is not None else time.time()
+        while self._heap:
+            next_run, _, key = self._heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry.next_run == next_run:
+                return max(0, next_run - now)
+            heapq.heappop(self._heap)
+        return None
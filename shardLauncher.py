@@ -0,0 +1,33 @@
+"""Starts the bot as several processes, each running an even slice of the shards.
+
+    python shardLauncher.py --shards 8 --processes 4
+"""
+import argparse, logging, os, subprocess, sys
+
+logging.basicConfig(level=logging.INFO)
+
+def shard_slices(shard_count, process_count):
+    """Splits shard ids 0..shard_count-1 round-robin over `process_count` processes."""
+    return [list(range(index, shard_count, process_count)) for index in range(process_count)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Discord bot as multiple sharded processes.")
+    parser.add_argument("--shards", type=int, required=True, help="total number of gateway shards")
+    parser.add_argument("--processes", type=int, required=True, help="number of bot processes")
+    args = parser.parse_args()
+
+    bot_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "discordBot.py")
+    processes = []
+    for shard_ids in shard_slices(args.shards, min(args.processes, args.shards)):
+        env = {**os.environ, "SHARD_COUNT": str(args.shards), "SHARD_IDS": ",".join(map(str, shard_ids))}
+        logging.info(f"🚀 Starting bot process for shards {shard_ids}")
+        processes.append(subprocess.Popen([sys.executable, bot_path], env=env))
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+if __name__ == '__main__':
+    main()
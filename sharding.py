@@ -0,0 +1,22 @@
+"""Shard layout for running the bot as several AutoShardedBot processes.
+
+SHARD_COUNT is the total number of gateway shards across every process and SHARD_IDS the comma separated
+shards this process runs (e.g. SHARD_COUNT=4 SHARD_IDS=0,1). Leave both unset for a single process that
+lets Discord pick the shard count.
+"""
+import os
+
+SHARD_COUNT = int(os.getenv("SHARD_COUNT")) if os.getenv("SHARD_COUNT") else None
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv("SHARD_IDS", "").split(",") if shard_id.strip()] or None
+
+def shard_for_guild(guild_id, shard_count=SHARD_COUNT):
+    """Discord's shard formula: (guild_id >> 22) % shard_count."""
+    if not shard_count:
+        return 0
+    return (int(guild_id) >> 22) % shard_count
+
+def owns_guild(guild_id):
+    """True if this process runs the shard that `guild_id` lives on."""
+    if not SHARD_COUNT or SHARD_IDS is None:
+        return True
+    return shard_for_guild(guild_id) in SHARD_IDS
@@ -0,0 +1,67 @@
+"""Warm-restart snapshot of in-memory state (lookup caches, live snapshot, scan cursors).
+
+Each piece of state registers a dump/load pair with a TTL. save_snapshot() writes one JSON line per
+entry to STATE_SNAPSHOT_PATH, atomically, and load_snapshot() restores the entries that are still fresh.
+"""
+import json, logging, os, time
+
+STATE_SNAPSHOT_PATH = os.getenv("STATE_SNAPSHOT_PATH", "state_snapshot.jsonl")
+
+_providers = {}  # name -> (dump, load, ttl seconds)
+
+def register(name, dump, load, ttl):
+    """Registers state to snapshot: dump() returns JSON-serialisable data, load(data) restores it.
+
+    save_snapshot() runs in a worker thread while the event loop keeps changing the state, so dump() should
+    return a copy (dict(state), list(state.items())) rather than the live object.
+    """
+    _providers[name] = (dump, load, ttl)
+
+def save_snapshot(path=STATE_SNAPSHOT_PATH):
+    saved_at = time.time()
+    tmp_path = f"{path}.tmp"
+    lines = []
+    for name, (dump, _, _) in list(_providers.items()):
+        try:
+            lines.append(json.dumps({"name": name, "saved_at": saved_at, "data": dump()}) + "\n")
+        except RuntimeError as e:
+            # Changed while being dumped; the next snapshot picks it up
+            logging.warning(f"⚠️ Skipping snapshot entry '{name}': {e}")
+        except (TypeError, ValueError) as e:
+            logging.error(f"⚠️ Failed to dump snapshot entry '{name}': {e}")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as snapshot:
+            snapshot.writelines(lines)
+        os.replace(tmp_path, path)
+        logging.info(f"💾 Saved state snapshot ({len(lines)} entries) to {path}")
+    except OSError as e:
+        logging.error(f"⚠️ Failed to save state snapshot: {e}")
+
+def load_snapshot(path=STATE_SNAPSHOT_PATH):
+    """Restores registered state from `path`, skipping entries older than their TTL."""
+    if not os.path.exists(path):
+        logging.info("♻️ No state snapshot found, starting cold")
+        return 0
+    restored = 0
+    now = time.time()
+    with open(path, encoding="utf-8") as snapshot:
+        for line in snapshot:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logging.warning("⚠️ Skipping corrupt state snapshot line")
+                continue
+            provider = _providers.get(entry.get("name"))
+            if not provider:
+                continue
+            _, load, ttl = provider
+            if now - entry.get("saved_at", 0) > ttl:
+                logging.info(f"♻️ Snapshot entry '{entry['name']}' expired, skipping")
+                continue
+            try:
+                load(entry["data"])
+                restored += 1
+            except Exception as e:
+                logging.error(f"⚠️ Failed to restore snapshot entry '{entry['name']}': {e}")
+    logging.info(f"♻️ Restored {restored} state snapshot entries from {path}")
+    return restored
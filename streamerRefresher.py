@@ -0,0 +1,83 @@
+"""Background refresh of stale Broadcaster rows.
+
+Each broadcaster is stored once however many guilds track it, so it is refreshed once too. Picks the rows
+with the oldest updated_at, re-reads them from Helix in batched /channels and /streams
+calls and rewrites only the rows whose Twitch data changed. Unchanged rows just get their updated_at
+bumped in one statement, so updated_at always says when a row was last verified.
+"""
+import logging, os
+from datetime import datetime, timezone
+
+from database import db_manager, Broadcaster, Streamer
+from gameCatalog import resolve_games
+from twitchFuncs import get_multiple_channels, get_multiple_streams
+
+REFRESH_BATCH_SIZE = int(os.getenv("REFRESH_BATCH_SIZE", "100"))
+
+def fresh_fields(channel, stream):
+    """The Broadcaster columns as Helix reports them now."""
+    return {
+        "broadcaster_name": channel["broadcaster_name"],
+        "broadcaster_language": channel["broadcaster_language"],
+        "game_name": channel["game_name"],
+        "game_id": channel["game_id"],
+        "title": channel["title"],
+        "tags": channel["tags"],
+        "viewers": stream["viewer_count"] if stream else 0,
+    }
+
+def refresh_stale_streamers(limit=REFRESH_BATCH_SIZE, guild_ids=None):
+    """Refreshes up to `limit` of the stalest rows (optionally only for `guild_ids`). Returns (checked, changed)."""
+    session = db_manager.get_session()
+    try:
+        query = session.query(Broadcaster)
+        if guild_ids is not None:
+            tracked = session.query(Streamer.broadcaster_id).filter(
+                Streamer.guild_id.in_([str(guild_id) for guild_id in guild_ids]))
+            query = query.filter(Broadcaster.broadcaster_id.in_(tracked))
+        rows = query.order_by(Broadcaster.updated_at.is_not(None), Broadcaster.updated_at).limit(limit).all()
+        if not rows:
+            return 0, 0
+
+        broadcaster_ids = [row.broadcaster_id for row in rows]
+        channels, streams = {}, {}
+        for i in range(0, len(broadcaster_ids), 100):
+            batch = broadcaster_ids[i:i + 100]
+            channel_result = get_multiple_channels(batch)
+            stream_result = get_multiple_streams(user_ids=batch)
+            if not channel_result["success"] or not stream_result["success"]:
+                # Leave the rows stale so they are retried on the next run
+                logging.warning("⚠️ Helix unavailable, skipping streamer refresh")
+                return 0, 0
+            channels.update({channel["broadcaster_id"]: channel for channel in channel_result["data"]})
+            streams.update({stream["user_id"]: stream for stream in stream_result["data"]})
+        resolve_games([channel["game_id"] for channel in channels.values()])
+
+        now = datetime.now(timezone.utc)
+        changed, unchanged = 0, []
+        for row in rows:
+            channel = channels.get(row.broadcaster_id)
+            fields = fresh_fields(channel, streams.get(row.broadcaster_id)) if channel else {}
+            updates = {column: value for column, value in fields.items() if getattr(row, column) != value}
+            if updates:
+                for column, value in updates.items():
+                    setattr(row, column, value)
+                row.updated_at = now
+                changed += 1
+            else:
+                # Unchanged, or no longer on Twitch: only mark as verified
+                unchanged.append(row.broadcaster_id)
+        session.flush()
+        if unchanged:
+            session.query(Broadcaster).filter(
+                Broadcaster.broadcaster_id.in_(unchanged)
+            ).update({Broadcaster.updated_at: now}, synchronize_session=False)
+        session.commit()
+        logging.info(f"🔄 Refreshed {len(rows)} stale broadcasters, {changed} changed")
+        return len(rows), changed
+    except Exception as e:
+        session.rollback()
+        logging.error(f"⚠️ Streamer refresh failed: {e}")
+        return 0, 0
+    finally:
+        session.close()
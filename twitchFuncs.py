@@ -1,64 +1,100 @@
-import os, logging, requests, time
+import asyncio, os, logging, requests, threading, time
 from datetime import datetime, timezone
 
-import discord
-from playwright.async_api import async_playwright
+from resilience import HTTP_TIMEOUT, breaker_for, resilient_get
 
-# Logging
-logging.basicConfig(level=logging.INFO)
+# Nothing here touches the network or loads Playwright at import time: the OAuth token is fetched on
+# first use (or prewarmed from the bot's setup_hook) and Playwright is imported by the tag scraper.
+# Helix GETs go through resilience.resilient_get (timeouts, retries, per-endpoint circuit breakers);
+# lookups behind interactive commands pass hedge=True, background loops leave it off so a slow Twitch
+# does not get every request twice.
 
-#Establish Environmental Variables
-from dotenv import load_dotenv
-load_dotenv()
+SCRAPER_TIMEOUT_MS = int(os.getenv("SCRAPER_TIMEOUT_MS", "30000"))
 
 # Get Twitch Token
-TWITCH_CLIENT_ID = os.getenv("TWITCH_CLIENT_ID")
-TWITCH_CLIENT_SECRET = os.getenv("TWITCH_CLIENT_SECRET")
 def get_tokens():
     # Twitch Token Get
     logging.info("Retrieving OAuth token...")
     url = "https://id.twitch.tv/oauth2/token"
     params = {
-        "client_id": TWITCH_CLIENT_ID,
-        "client_secret": TWITCH_CLIENT_SECRET,
+        "client_id": os.getenv("TWITCH_CLIENT_ID"),
+        "client_secret": os.getenv("TWITCH_CLIENT_SECRET"),
         "grant_type": "client_credentials"
     }
-    response = requests.post(url, params=params)
+    response = requests.post(url, params=params, timeout=HTTP_TIMEOUT)
     response.raise_for_status()
     twitch_token = response.json()["access_token"]
     logging.info("✅ Twitch OAuth token acquired.")
     return twitch_token
 
-TWITCH_TOKEN = get_tokens()
-TWITCH_HEADERS = {
-    "Client-ID": TWITCH_CLIENT_ID,
-    "Authorization": f"Bearer {TWITCH_TOKEN}"
-}
+_twitch_headers = None
+_twitch_headers_lock = threading.Lock()
+
+def get_headers():
+    """Returns the Helix request headers, fetching the OAuth token on first use."""
+    global _twitch_headers
+    if _twitch_headers is None:
+        with _twitch_headers_lock:
+            if _twitch_headers is None:
+                _twitch_headers = {
+                    "Client-ID": os.getenv("TWITCH_CLIENT_ID"),
+                    "Authorization": f"Bearer {get_tokens()}"
+                }
+    return _twitch_headers
+
+# Helix /users lookups by login; identity data rarely changes so it is cached for USER_CACHE_TTL seconds
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "3600"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+_user_cache = {}  # login -> (fetched_at, user data)
+
+def cache_user(user, fetched_at=None):
+    _user_cache.pop(user["login"], None)
+    _user_cache[user["login"]] = (fetched_at or time.time(), user)
+    if len(_user_cache) > USER_CACHE_SIZE:
+        # Oldest insert first
+        _user_cache.pop(next(iter(_user_cache)))
+
+def dump_user_cache():
+    """Serialisable copy of the /users cache for the warm-restart snapshot."""
+    # Copied in one step first: this runs off the event loop while lookups keep filling the cache
+    return [[fetched_at, user] for fetched_at, user in list(_user_cache.values())]
+
+def load_user_cache(entries):
+    """Restores cached /users entries that are still within USER_CACHE_TTL."""
+    now = time.time()
+    for fetched_at, user in entries:
+        if now - fetched_at < USER_CACHE_TTL:
+            cache_user(user, fetched_at)
+    logging.info(f"♻️ Restored {len(_user_cache)} cached Twitch users")
 
 # ✅ Fetch Info from Twitch API
-def get_streamer_info(broadcaster_login):
+def get_streamer_info(broadcaster_login, hedge=False):
     """Fetch Twitch user data, handling errors gracefully."""
+    cached = _user_cache.get((broadcaster_login or "").lower())
+    if cached and time.time() - cached[0] < USER_CACHE_TTL:
+        return {"success": True, "data": cached[1]}
     logging.info(f"Fetching streamer info for broadcaster_login: {broadcaster_login}...")
     url = f"https://api.twitch.tv/helix/users?login={broadcaster_login}"
     try:
-        response = requests.get(url, headers=TWITCH_HEADERS)
+        response = resilient_get(url, "helix/users", hedge=hedge, headers=get_headers())
         response.raise_for_status()  # Raises an HTTPError for bad responses (4xx, 5xx)
         data = response.json()
         if "data" in data and data["data"]:
+            cache_user(data["data"][0])
             return {"success": True, "data": data["data"][0]}
         else:
             return {"success": False, "data": "No user data found"}
     except requests.exceptions.RequestException as e:
         return {"success": False, "data": str(e)}
 
-def get_channel_info(broadcaster_id):
+def get_channel_info(broadcaster_id, hedge=False):
     logging.info(f"Fetching channel info for broadcaster ID: {broadcaster_id}...")
     url = "https://api.twitch.tv/helix/channels"
     params = {
         "broadcaster_id": broadcaster_id
     }
     try:
-        response = requests.get(url, headers=TWITCH_HEADERS, params=params)
+        response = resilient_get(url, "helix/channels", hedge=hedge, headers=get_headers(), params=params)
         response.raise_for_status()
         data = response.json()
         if "data" in data and data["data"]:
@@ -68,7 +104,7 @@ def get_channel_info(broadcaster_id):
     except requests.exceptions.RequestException as e:
         return {"success": False, "data": str(e)}
 
-def get_stream_info(broadcaster_login):
+def get_stream_info(broadcaster_login, hedge=False):
     logging.info(f"Fetching stream info for broadcaster login: {broadcaster_login}...")
     url = "https://api.twitch.tv/helix/streams"
     params = {
@@ -76,7 +112,7 @@ def get_stream_info(broadcaster_login):
         "type": 'all'
     }
     try:
-        response = requests.get(url, headers=TWITCH_HEADERS, params=params)
+        response = resilient_get(url, "helix/streams", hedge=hedge, headers=get_headers(), params=params)
         response.raise_for_status()
         data = response.json()
         if "data" in data and data["data"]:
@@ -115,7 +151,7 @@ def get_multiple_streams(user_ids=None, user_logins=None):
             params.append(("user_login", login))
 
     try:
-        response = requests.get(url, headers=TWITCH_HEADERS, params=params)
+        response = resilient_get(url, "helix/streams", headers=get_headers(), params=params)
         response.raise_for_status()
         data = response.json()
         return {"success": True, "data": data["data"] if "data" in data else []}
@@ -123,7 +159,78 @@ def get_multiple_streams(user_ids=None, user_logins=None):
         logging.error(f"Error fetching multiple streams: {e}")
         return {"success": False, "data": str(e)}
 
-def search_channels_by_term(search_term):
+def get_users_by_login(broadcaster_logins):
+    """Fetch /users for up to 100 logins in one request; cached users are not requested again."""
+    logins = [login.lower() for login in broadcaster_logins[:100]]
+    now = time.time()
+    users = [_user_cache[login][1] for login in logins
+             if login in _user_cache and now - _user_cache[login][0] < USER_CACHE_TTL]
+    cached_logins = {user["login"] for user in users}
+    missing = [login for login in logins if login not in cached_logins]
+    if not missing:
+        return {"success": True, "data": users}
+    logging.info(f"Fetching {len(missing)} users by login...")
+    url = "https://api.twitch.tv/helix/users"
+    params = [("login", login) for login in missing]
+    try:
+        response = resilient_get(url, "helix/users", headers=get_headers(), params=params)
+        response.raise_for_status()
+        data = response.json()
+        for user in data.get("data", []):
+            cache_user(user)
+            users.append(user)
+        return {"success": True, "data": users}
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Error fetching users by login: {e}")
+        return {"success": False, "data": str(e)}
+
+def get_multiple_channels(broadcaster_ids):
+    """Fetch /channels for up to 100 broadcaster IDs in one request."""
+    logging.info(f"Fetching multiple channels (ids: {len(broadcaster_ids)})...")
+    url = "https://api.twitch.tv/helix/channels"
+    params = [("broadcaster_id", broadcaster_id) for broadcaster_id in broadcaster_ids[:100]]
+    try:
+        response = resilient_get(url, "helix/channels", headers=get_headers(), params=params)
+        response.raise_for_status()
+        data = response.json()
+        return {"success": True, "data": data["data"] if "data" in data else []}
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Error fetching multiple channels: {e}")
+        return {"success": False, "data": str(e)}
+
+def get_games(game_ids):
+    """Fetch /games for up to 100 game IDs in one request."""
+    logging.info(f"Fetching games (ids: {len(game_ids)})...")
+    url = "https://api.twitch.tv/helix/games"
+    params = [("id", game_id) for game_id in game_ids[:100]]
+    try:
+        response = resilient_get(url, "helix/games", headers=get_headers(), params=params)
+        response.raise_for_status()
+        data = response.json()
+        return {"success": True, "data": data["data"] if "data" in data else []}
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Error fetching games: {e}")
+        return {"success": False, "data": str(e)}
+
+def hydrate_streamers(broadcaster_logins):
+    """Builds TwitchStreamers for up to 100 logins with one /users, one /channels and one /streams call.
+
+    Logins that don't resolve to a Twitch user are left out.
+    """
+    users = get_users_by_login(broadcaster_logins)
+    if not users["success"] or not users["data"]:
+        return []
+    broadcaster_ids = [user["id"] for user in users["data"]]
+    channels = get_multiple_channels(broadcaster_ids)
+    streams = get_multiple_streams(user_ids=broadcaster_ids)
+    channels_by_id = {c["broadcaster_id"]: c for c in channels["data"]} if channels["success"] else {}
+    streams_by_id = {s["user_id"]: s for s in streams["data"]} if streams["success"] else {}
+    return [
+        TwitchStreamer.from_helix(user, channels_by_id.get(user["id"]), streams_by_id.get(user["id"]))
+        for user in users["data"]
+    ]
+
+def search_channels_by_term(search_term, hedge=False):
     logging.info(f"🔎 Searching live channels for '{search_term}'...")
     search_term = search_term.replace(" ","%20")
     url = "https://api.twitch.tv/helix/search/channels"
@@ -133,7 +240,7 @@ def search_channels_by_term(search_term):
         "first": 100  # Limit to 20 results for testing; can adjust as needed
     }
     try:
-        response = requests.get(url, headers=TWITCH_HEADERS, params=params)
+        response = resilient_get(url, "helix/search/channels", hedge=hedge, headers=get_headers(), params=params)
         response.raise_for_status()
         data = response.json()
         if "data" in data and data["data"]:
@@ -143,93 +250,247 @@ def search_channels_by_term(search_term):
     except requests.exceptions.RequestException as e:
         return {"success": False, "data": str(e)}
 
-async def search_live_channel_by_tag(tag):
-    """Asynchronously searches Twitch for streamers under a specific tag."""
-    logging.info(f"🔎 Searching for streamers under '{tag}' tag...")
-    total_streamers_found = 0
-    streamers = []
+def normalize_tag(tag):
+    """Tags are matched case-insensitively."""
+    return (tag or "").lower()
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+async def search_live_channels_by_tags(tags, page_tag=None):
+    """Loads one tag directory page and matches every stream it captures against all of `tags` at once.
 
-        async def handle_response(response):
-            """Handles Twitch API GraphQL responses."""
-            nonlocal total_streamers_found
-            if "https://gql.twitch.tv/gql" in response.url and response.request.method == "POST":
+    `page_tag` picks the directory page (the first of `tags` by default). Returns
+    {normalised tag: [Helix /channels entries]} for each of `tags` that at least one live stream carries.
+    """
+    wanted = {normalize_tag(tag) for tag in tags}
+    page_tag = page_tag or next(iter(tags))
+    logging.info(f"🔎 Searching the '{page_tag}' directory for {len(wanted)} tags...")
+    matches = {}  # normalised tag -> broadcaster ids
+
+    async def handle_response(response):
+        """Handles Twitch API GraphQL responses."""
+        if "https://gql.twitch.tv/gql" in response.url and response.request.method == "POST":
+            try:
+                json_data = await response.json()
+                for entry in json_data:
+                    if isinstance(entry, dict) and "data" in entry:
+                        streams_data = ((entry["data"] or {}).get("streams") or {}).get("edges") or []
+                        for stream_entry in streams_data:
+                            node = stream_entry.get("node") or {}
+                            broadcaster_id = (node.get("broadcaster") or {}).get("id")
+                            if not broadcaster_id:
+                                continue
+                            node_tags = {normalize_tag(t.get("name")) for t in node.get("freeformTags") or []}
+                            for tag in node_tags & wanted:
+                                matches.setdefault(tag, set()).add(broadcaster_id)
+            except Exception as e:
+                logging.error(f"Error processing Twitch API response: {e}")
+
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+    breaker = breaker_for("tag-scraper")
+    if not breaker.allow():
+        logging.warning(f"🔌 Tag scraper circuit is open, skipping '{page_tag}'")
+        return {}
+
+    loaded = False
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                page = await browser.new_page()
+                page.set_default_timeout(SCRAPER_TIMEOUT_MS)
+                page.on("response", handle_response)
+
+                await page.goto(f"https://www.twitch.tv/directory/all/tags/{page_tag}", timeout=SCRAPER_TIMEOUT_MS)
+                loaded = True
+                breaker.record_success()
                 try:
-                    json_data = await response.json()
-                    for entry in json_data:
-                        if isinstance(entry, dict) and "data" in entry:
-                            streams_data = entry["data"].get("streams", {}).get("edges", [])
-                            for stream_entry in streams_data:
-                                node = stream_entry.get("node", {})
-                                tags = node.get("freeformTags", None)
-                                for iTag in tags:
-                                    if tag.lower() == iTag.get('name').lower():
-                                        broadcaster_id = node.get("broadcaster").get("id")
-                                        streamers.append(get_channel_info(broadcaster_id))
-                                        total_streamers_found += 1
-                except Exception as e:
-                    logging.error(f"Error processing Twitch API response: {e}")
-
-        page.on("response", handle_response)
-
-        await page.goto(f"https://www.twitch.tv/directory/all/tags/{tag}")
-        await page.wait_for_load_state("networkidle")
-
-        await browser.close()
-        return streamers, total_streamers_found
+                    await page.wait_for_load_state("networkidle", timeout=SCRAPER_TIMEOUT_MS)
+                except PlaywrightTimeoutError:
+                    # The directory can keep polling forever; keep whatever arrived before the deadline
+                    logging.warning(f"⚠️ Tag page for '{page_tag}' never went idle, using the streams captured so far")
+            finally:
+                await browser.close()
+    except Exception as e:
+        if not loaded:
+            logging.error(f"⚠️ Could not load tag page for '{page_tag}': {e}")
+            return {}
+        logging.warning(f"⚠️ Scraper for '{page_tag}' failed after the page loaded, using the streams captured so far: {e}")
+    finally:
+        if not loaded:
+            # Any failure before the page loaded (driver, browser launch, navigation, cancellation) is an
+            # outcome for the breaker, so a half-open trial can never stay pending
+            breaker.record_failure()
+
+    # One /channels call per 100 broadcasters, shared by every tag they matched
+    broadcaster_ids = sorted(set().union(*matches.values()))
+    channels = {}
+    for i in range(0, len(broadcaster_ids), 100):
+        result = await asyncio.to_thread(get_multiple_channels, broadcaster_ids[i:i + 100])
+        if result["success"]:
+            channels.update({channel["broadcaster_id"]: channel for channel in result["data"]})
+    found = {tag: [channels[broadcaster_id] for broadcaster_id in ids if broadcaster_id in channels]
+             for tag, ids in matches.items()}
+    logging.info(f"✅ '{page_tag}' directory matched {', '.join(f'{tag}: {len(c)}' for tag, c in found.items()) or 'nothing'}")
+    return found
 
 class TwitchStreamer():
-    def __init__(self, broadcaster_login):
+    """Twitch broadcaster record built from the Helix users, channels and streams endpoints.
+
+    Display fields (live_for, live_message, streamer_display, mature_flag...) are derived on access
+    instead of being formatted up front, and __slots__ keeps each instance small.
+
+    With lazy=True nothing is fetched up front; each group of fields is fetched on first access
+    from the endpoint that owns it (see _FIELD_GROUPS), so identity-only callers pay for one call.
+    """
+    __slots__ = (
+        "broadcaster_id",
+        "broadcaster_language",
+        "broadcaster_login",  # all lowercase version of broadcaster_name
+        "broadcaster_name",
+        "broadcaster_type",
+        "channel_tags",
+        "created_at",
+        "description",
+        "game_id",
+        "game_name",
+        "is_live",
+        "is_mature",
+        "offline_image_url",
+        "profile_image_url",
+        "started_at",
+        "thumbnail_url",
+        "title",
+        "type",
+        "viewers",
+        "_loaded",  # bitmask of the _GROUP_BITS loaded so far, plus _HEDGE
+    )
+
+    # Field -> group of fields fetched together, each group owned by one Helix endpoint
+    _FIELD_GROUPS = {
+        **dict.fromkeys(("broadcaster_id", "broadcaster_name", "broadcaster_type", "created_at", "description",
+                         "offline_image_url", "profile_image_url"), "users"),
+        **dict.fromkeys(("broadcaster_language", "game_id", "game_name", "title", "channel_tags"), "channels"),
+        **dict.fromkeys(("type", "is_live", "started_at", "is_mature", "viewers", "thumbnail_url"), "streams"),
+    }
+    _FIELDS = tuple(_FIELD_GROUPS)
+    _GROUP_BITS = {"users": 1, "channels": 2, "streams": 4}
+    _ALL_LOADED = 7
+    _HEDGE = 8  # fetches are hedged, set for streamers looked up by an interactive command
+
+    def __init__(self, broadcaster_login, fetch=True, lazy=False, hedge=False):
+        self.broadcaster_login = broadcaster_login
+        if lazy:
+            # Fields stay unset until __getattr__ loads their group
+            self._loaded = self._HEDGE if hedge else 0
+            return
         # Define user details
-        self.broadcaster_id = None
-        self.broadcaster_language = None
-        self.broadcaster_login = broadcaster_login #all lowercase version of broadcaster_name
-        self.broadcaster_name = None
-        self.broadcaster_type = None
-        self.channel_tags = None
-        self.created_at = None
-        self.description = None
-        self.game_id = None
-        self.game_name = None
-        self.is_live = None
-        self.is_mature = None
-        self.is_partnered = None
-        self.is_verified = None
-        self.live_for = None
-        self.live_message = None
-        self.live_status = None
-        self.mature_flag = None
-        self.offline_image_url = None
-        self.profile_image_url = None
-        self.started_at = None
-        self.thumbnail_url = None
-        self.title = None
-        self.type = None
-        self.url = f"https://www.twitch.tv/{self.broadcaster_login}"
-        self.viewers = None
-        self.streamer_display = None
+        self._loaded = self._ALL_LOADED | self._HEDGE if hedge else self._ALL_LOADED
+        for field in self._FIELDS:
+            setattr(self, field, None)
         # Update user details
-        self.update()
+        if fetch:
+            self.update()
+
+    def __getattr__(self, name):
+        # Only called for slots that have not been set yet, i.e. fields of a lazy group not loaded so far
+        group = self._FIELD_GROUPS.get(name)
+        if group is None or self._loaded & self._GROUP_BITS[group]:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        self.load(group)
+        return object.__getattribute__(self, name)
+
+    def _peek(self, name):
+        """Returns a field's current value without triggering a lazy load."""
+        try:
+            return object.__getattribute__(self, name)
+        except AttributeError:
+            return None
 
-    def get_streamer_info(self):
-        streamer_info = get_streamer_info(self.broadcaster_login)
-        if streamer_info["success"]:
-            self.broadcaster_id = streamer_info["data"]["id"]
-            self.broadcaster_name = streamer_info["data"]["display_name"]
-            self.broadcaster_type = streamer_info["data"]["broadcaster_type"]
-            self.created_at = streamer_info["data"]["created_at"]
-            self.description = streamer_info["data"]["description"]
-            self.offline_image_url = streamer_info["data"]["offline_image_url"]
-            self.profile_image_url = streamer_info["data"]["profile_image_url"] or "https://static.twitchcdn.net/assets/default-profile.png"
-            self.viewers = streamer_info["data"]["view_count"] or 0
-            return True
+    def _fill_identity(self, broadcaster_id, broadcaster_name):
+        """Takes the ID and name from a /channels or /streams payload unless /users already set them."""
+        if self._loaded & self._GROUP_BITS["users"]:
+            # Users fields are always set once their group is loaded, no need to peek
+            self.broadcaster_id = self.broadcaster_id or broadcaster_id
+            self.broadcaster_name = self.broadcaster_name or broadcaster_name
         else:
-            return False
-
-    def get_channel_info(self):
+            self.broadcaster_id = self._peek("broadcaster_id") or broadcaster_id
+            self.broadcaster_name = self._peek("broadcaster_name") or broadcaster_name
+
+    def load(self, group):
+        """Fetches one group of fields ("users", "channels" or "streams") from its endpoint."""
+        self._loaded |= self._GROUP_BITS[group]
+        for field, field_group in self._FIELD_GROUPS.items():
+            if field_group == group and self._peek(field) is None:
+                setattr(self, field, None)
+        if group == "users":
+            return self.get_streamer_info()
+        elif group == "channels":
+            return self.get_channel_info()
+        return self.get_stream_info()
+
+    @classmethod
+    def from_helix(cls, user=None, channel=None, stream=None):
+        """Builds a streamer from already fetched Helix dicts without any network calls.
+
+        `stream` is the /streams entry for the broadcaster, or None when they are offline.
+        """
+        broadcaster_login = ((user or {}).get("login") or (channel or {}).get("broadcaster_login")
+                             or (stream or {}).get("user_login"))
+        streamer = cls(broadcaster_login, fetch=False)
+        if user:
+            streamer.apply_streamer_info(user)
+        if channel:
+            streamer.apply_channel_info(channel)
+        streamer.apply_stream_info(stream)
+        return streamer
+
+    @property
+    def hedged(self):
+        return bool(self._loaded & self._HEDGE)
+
+    # Derived display fields
+    @property
+    def url(self):
+        return f"https://www.twitch.tv/{self.broadcaster_login}"
+
+    @property
+    def live_for(self):
+        if not self.is_live or not self.started_at:
+            return ""
+        start_time = datetime.strptime(self.started_at, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        time_diff = datetime.now(timezone.utc) - start_time
+        # Convert to hours and minutes
+        hours, remainder = divmod(int(time_diff.total_seconds()), 3600)
+        minutes, _ = divmod(remainder, 60)
+        return f"{hours}:{minutes:02d}" if hours else f"{minutes} mins"
+
+    @property
+    def mature_flag(self):
+        return " 🔞" if self.is_mature else ""
+
+    @property
+    def live_status(self):
+        return "🟢 **Live Now**" if self.is_live else "⚫ **Offline Now**"
+
+    @property
+    def live_message(self):
+        return f"{self.live_status} | **Live for:** `{self.live_for}`" if self.is_live else self.live_status
+
+    @property
+    def streamer_display(self):
+        return f"[{self.broadcaster_name}](https://twitch.tv/{self.broadcaster_login}){self.mature_flag}"
+
+    def apply_streamer_info(self, data):
+        self.broadcaster_id = data["id"]
+        self.broadcaster_login = data.get("login") or self.broadcaster_login
+        self.broadcaster_name = data["display_name"]
+        self.broadcaster_type = data["broadcaster_type"]
+        self.created_at = data["created_at"]
+        self.description = data["description"]
+        self.offline_image_url = data["offline_image_url"]
+        self.profile_image_url = data["profile_image_url"] or "https://static.twitchcdn.net/assets/default-profile.png"
+
+    def apply_channel_info(self, data):
         # get_channel_info results
         # {
         #     'broadcaster_id': '735927359',
@@ -244,18 +505,14 @@ class TwitchStreamer():
         #     'content_classification_labels': [],
         #     'is_branded_content': False
         # }
-        channel_info = get_channel_info(self.broadcaster_id)
-        if channel_info["success"]:
-            self.broadcaster_language = channel_info['data']["broadcaster_language"]
-            self.game_id = channel_info['data']["game_id"]
-            self.game_name = channel_info['data']["game_name"]
-            self.title = channel_info['data']["title"]
-            self.channel_tags = channel_info['data']["tags"]
-            return True
-        else:
-            return False
-
-    def get_stream_info(self):
+        self._fill_identity(data.get("broadcaster_id"), data.get("broadcaster_name"))
+        self.broadcaster_language = data["broadcaster_language"]
+        self.game_id = data["game_id"]
+        self.game_name = data["game_name"]
+        self.title = data["title"]
+        self.channel_tags = data["tags"]
+
+    def apply_stream_info(self, data):
         # get_stream_info results
         # {
         #     'id': '316506378489',
@@ -274,35 +531,42 @@ class TwitchStreamer():
         #     'tags': ['AMA', 'ChillVibes', 'English', 'Photoshop', 'Editing', 'Photography'],
         #     'is_mature': False
         # }
-        stream_info = get_stream_info(self.broadcaster_login)
-        if stream_info["success"] and stream_info["data"]:
-            self.type = stream_info["data"]["type"]
-            self.is_live = True if self.type == "live" else False
-            self.started_at = stream_info["data"]["started_at"]
-            self.is_mature = stream_info["data"]["is_mature"]
-            if self.is_live and self.started_at:
-                start_time = datetime.strptime(self.started_at, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
-                now_time = datetime.now(timezone.utc)
-                time_diff = now_time - start_time
-                # Convert to hours and minutes
-                hours, remainder = divmod(time_diff.seconds, 3600)
-                minutes, _ = divmod(remainder, 60)
-                self.live_for = f"{hours}:{minutes:02d}" if hours else f"{minutes} mins"
-            self.mature_flag = " 🔞" if self.is_mature else ""
-            self.streamer_display = f"[{self.broadcaster_name}](https://twitch.tv/{self.broadcaster_login}){self.mature_flag}"
-            self.viewers = stream_info["data"]["viewer_count"]
-            self.thumbnail_url = stream_info["data"]["thumbnail_url"]
+        if data:
+            self.type = data["type"]
+            self.is_live = self.type == "live"
+            self.started_at = data["started_at"]
+            self.is_mature = data["is_mature"]
+            self.viewers = data["viewer_count"]
+            self.thumbnail_url = data["thumbnail_url"]
+            self._fill_identity(data.get("user_id"), data.get("user_name"))
         else:
             self.type = "offline"
             self.is_live = False
             self.started_at = None
             self.is_mature = False
-            self.live_for = ""
-            self.mature_flag = ""
             self.viewers = 0
-        self.live_status = "🟢 **Live Now**" if self.is_live else "⚫ **Offline Now**"
-        self.live_message = f"{self.live_status} | **Live for:** `{self.live_for}`" if self.is_live else self.live_status
-        self.streamer_display = f"[{self.broadcaster_name}](https://twitch.tv/{self.broadcaster_login}){self.mature_flag}"
+
+    def get_streamer_info(self):
+        streamer_info = get_streamer_info(self.broadcaster_login, hedge=self.hedged)
+        if streamer_info["success"]:
+            self.apply_streamer_info(streamer_info["data"])
+            return True
+        else:
+            return False
+
+    def get_channel_info(self):
+        if not self.broadcaster_id:
+            return False
+        channel_info = get_channel_info(self.broadcaster_id, hedge=self.hedged)
+        if channel_info["success"]:
+            self.apply_channel_info(channel_info["data"])
+            return True
+        else:
+            return False
+
+    def get_stream_info(self):
+        stream_info = get_stream_info(self.broadcaster_login, hedge=self.hedged)
+        self.apply_stream_info(stream_info["data"] if stream_info["success"] else None)
         return True
 
     def get_thumbnail_url(self, width=1920, height=1080):
@@ -311,16 +575,24 @@ class TwitchStreamer():
         else:
             return None
 
+    def as_dict(self):
+        return {"broadcaster_login": self.broadcaster_login,
+                **{field: getattr(self, field) for field in self._FIELD_GROUPS}}
+
     def update(self):
+        self._loaded |= self._ALL_LOADED
         self.get_streamer_info()
         self.get_channel_info()
         self.get_stream_info()
 
 def main():
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
     broadcaster = "syronius"
     results = TwitchStreamer(broadcaster)
 
-    print(results.__dict__)
+    print(results.as_dict())
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,126 @@
+"""Viewer-count time series: 1-minute samples rolled up into hourly and then daily buckets.
+
+Samples come from the live polling path. roll_up_viewer_samples() aggregates every completed hour into
+hourly rollups and every completed day into daily rollups, then prunes raw samples and hourly rollups once
+they are older than their retention. get_viewer_stats() answers from the rollups and only reads raw
+samples for the hour that has not been rolled up yet.
+"""
+import logging, os, time
+
+from sqlalchemy import func
+
+from database import db_manager, insert_for, ViewerSample, ViewerRollup
+
+SAMPLE_SECONDS = 60
+HOUR = 3600
+DAY = 86400
+RAW_RETENTION_SECONDS = int(os.getenv("VIEWER_RAW_RETENTION_HOURS", "48")) * HOUR
+HOURLY_RETENTION_SECONDS = int(os.getenv("VIEWER_HOURLY_RETENTION_DAYS", "30")) * DAY
+
+def record_viewer_samples(streams, now=None):
+    """Stores one sample per live stream (Helix /streams entries) in a single batched insert."""
+    ts = int(now if now is not None else time.time()) // SAMPLE_SECONDS * SAMPLE_SECONDS
+    rows = [
+        {"broadcaster_id": stream["user_id"], "ts": ts, "viewers": int(stream.get("viewer_count") or 0)}
+        for stream in streams if stream.get("type", "live") == "live"
+    ]
+    if not rows:
+        return 0
+    session = db_manager.get_session()
+    # Several shards may sample the same broadcaster in the same minute, the first one wins
+    session.execute(insert_for(ViewerSample).on_conflict_do_nothing(), rows)
+    db_manager.close_session(session)
+    logging.info(f"📈 Recorded {len(rows)} viewer samples")
+    return len(rows)
+
+def _rolled_until(session, bucket_seconds):
+    """End of the newest rolled-up bucket of the given size, or None if nothing was rolled yet."""
+    latest = session.query(func.max(ViewerRollup.bucket_ts)).filter(ViewerRollup.bucket_seconds == bucket_seconds).scalar()
+    return latest + bucket_seconds if latest is not None else None
+
+def _merge_rollups(session, bucket_seconds, aggregates):
+    """Writes the aggregates as rollups with one native upsert, replacing buckets that were re-aggregated."""
+    if not aggregates:
+        return 0
+    statement = insert_for(ViewerRollup)
+    statement = statement.on_conflict_do_update(
+        index_elements=["broadcaster_id", "bucket_seconds", "bucket_ts"],
+        set_={name: statement.excluded[name] for name in ("samples", "viewer_sum", "viewer_peak")})
+    session.execute(statement, [
+        {"broadcaster_id": broadcaster_id, "bucket_seconds": bucket_seconds, "bucket_ts": int(bucket_ts),
+         "samples": samples, "viewer_sum": int(viewer_sum), "viewer_peak": viewer_peak}
+        for broadcaster_id, bucket_ts, samples, viewer_sum, viewer_peak in aggregates
+    ])
+    return len(aggregates)
+
+def roll_up_viewer_samples(now=None):
+    """Rolls completed hours into hourly rollups and completed days into daily ones, then prunes old rows."""
+    now = int(now if now is not None else time.time())
+    hour_end = now - now % HOUR
+    day_end = now - now % DAY
+    session = db_manager.get_session()
+
+    hour_bucket = ViewerSample.ts - ViewerSample.ts % HOUR
+    hourly = session.query(
+        ViewerSample.broadcaster_id, hour_bucket, func.count(), func.sum(ViewerSample.viewers),
+        func.max(ViewerSample.viewers)
+    ).filter(
+        ViewerSample.ts >= (_rolled_until(session, HOUR) or 0), ViewerSample.ts < hour_end
+    ).group_by(ViewerSample.broadcaster_id, hour_bucket).all()
+    hourly_count = _merge_rollups(session, HOUR, hourly)
+    session.flush()
+
+    day_bucket = ViewerRollup.bucket_ts - ViewerRollup.bucket_ts % DAY
+    daily = session.query(
+        ViewerRollup.broadcaster_id, day_bucket, func.sum(ViewerRollup.samples), func.sum(ViewerRollup.viewer_sum),
+        func.max(ViewerRollup.viewer_peak)
+    ).filter(
+        ViewerRollup.bucket_seconds == HOUR, ViewerRollup.bucket_ts >= (_rolled_until(session, DAY) or 0),
+        ViewerRollup.bucket_ts < day_end
+    ).group_by(ViewerRollup.broadcaster_id, day_bucket).all()
+    daily_count = _merge_rollups(session, DAY, daily)
+
+    # Raw samples and hourly buckets are only pruned once the next resolution up covers them
+    session.query(ViewerSample).filter(
+        ViewerSample.ts < min(hour_end, now - RAW_RETENTION_SECONDS)).delete(synchronize_session=False)
+    session.query(ViewerRollup).filter(
+        ViewerRollup.bucket_seconds == HOUR,
+        ViewerRollup.bucket_ts < min(day_end, now - HOURLY_RETENTION_SECONDS)).delete(synchronize_session=False)
+    db_manager.close_session(session)
+    logging.info(f"📊 Rolled up {hourly_count} hourly and {daily_count} daily viewer buckets")
+
+def get_viewer_stats(broadcaster_id, hours=24, now=None):
+    """Peak, average viewers and hours live for the last `hours` hours, at hour granularity.
+
+    Uses daily rollups where they exist, hourly rollups for the rest and raw samples only for the
+    time since the last hourly rollup.
+    """
+    now = int(now if now is not None else time.time())
+    since = now - now % HOUR - int(hours) * HOUR
+    session = db_manager.get_session()
+    try:
+        rollups = session.query(ViewerRollup).filter(
+            ViewerRollup.broadcaster_id == str(broadcaster_id), ViewerRollup.bucket_ts >= since - since % DAY).all()
+        hourly_until = _rolled_until(session, HOUR) or since
+        raw = session.query(
+            func.count(), func.sum(ViewerSample.viewers), func.max(ViewerSample.viewers)
+        ).filter(ViewerSample.broadcaster_id == str(broadcaster_id),
+                 ViewerSample.ts >= max(since, hourly_until)).one()
+    finally:
+        session.close()
+
+    # A day is only taken from its daily rollup if the whole day is inside the window
+    covered_days = {r.bucket_ts for r in rollups if r.bucket_seconds == DAY and r.bucket_ts >= since}
+    buckets = [r for r in rollups if r.bucket_seconds == DAY and r.bucket_ts in covered_days]
+    buckets += [r for r in rollups if r.bucket_seconds == HOUR and r.bucket_ts >= since
+                and r.bucket_ts - r.bucket_ts % DAY not in covered_days]
+
+    samples = sum(r.samples for r in buckets) + (raw[0] or 0)
+    viewer_sum = sum(r.viewer_sum for r in buckets) + (raw[1] or 0)
+    peak = max([r.viewer_peak for r in buckets] + [raw[2] or 0])
+    return {
+        "samples": samples,
+        "peak": peak,
+        "average": viewer_sum / samples if samples else 0,
+        "hours_live": samples * SAMPLE_SECONDS / HOUR,
+    }